@@ -0,0 +1,269 @@
+# actor_learner.py
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+
+from bang_game import NUM_ACTIONS
+from replay_memory import ReplayMemory
+from rng import game_seed
+from run_training import DQNAgent
+from state_encoder import state_size
+from vector_env import BangVectorEnv
+
+
+class SharedReplayMemory(ReplayMemory):
+    """
+    ReplayMemory whose arrays live in shared memory, so actor processes
+    write transitions straight into the learner's buffer (no pickling per
+    transition). Writers reserve their rows under a lock and fill them
+    outside it; a row that is being overwritten while sampled can come out
+    torn, which replay tolerates.
+
+    Build it before starting the processes and pass it to them as an argument.
+    """
+
+    def __init__(self, capacity, state_size, ctx=None, rng=None):
+        ctx = ctx or mp.get_context()
+        self._raw = {
+            "states": ctx.RawArray("f", capacity * state_size),
+            "next_states": ctx.RawArray("f", capacity * state_size),
+            "actions": ctx.RawArray("q", capacity),
+            "rewards": ctx.RawArray("f", capacity),
+            "dones": ctx.RawArray("b", capacity),
+        }
+        self._counters = ctx.RawArray("q", 2)     # next row, size
+        self._lock = ctx.Lock()
+        self.capacity = capacity
+        self.state_size = state_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._views()
+
+    def _views(self):
+        raw = self._raw
+        self.states = np.frombuffer(raw["states"], dtype=np.float32).reshape(self.capacity, self.state_size)
+        self.next_states = np.frombuffer(raw["next_states"], dtype=np.float32).reshape(self.capacity, self.state_size)
+        self.actions = np.frombuffer(raw["actions"], dtype=np.int64)
+        self.rewards = np.frombuffer(raw["rewards"], dtype=np.float32)
+        self.dones = np.frombuffer(raw["dones"], dtype=np.bool_)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("states", "next_states", "actions", "rewards", "dones"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rng = np.random.default_rng()
+        self._views()
+
+    @property
+    def _size(self):
+        return self._counters[1]
+
+    def push(self, state, action, reward, next_state, done):
+        return self.push_batch([state], [action], [reward], [next_state], [done])[0]
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        n = len(actions)
+        if n > self.capacity:
+            raise ValueError(f"batch of {n} transitions does not fit in capacity {self.capacity}")
+        with self._lock:
+            start = self._counters[0]
+            self._counters[0] = (start + n) % self.capacity
+        idx = (start + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        with self._lock:
+            self._counters[1] = min(self._counters[1] + n, self.capacity)
+        return idx
+
+
+class WeightBoard:
+    """
+    Shared-memory copy of the learner's model parameters plus the learner
+    update count they were published at.
+    """
+
+    def __init__(self, model, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.size = sum(p.numel() for p in model.parameters())
+        self._raw = ctx.RawArray("f", self.size)
+        self._version = ctx.RawValue("q", -1)
+        self._lock = ctx.Lock()
+
+    def publish(self, model, version):
+        flat = parameters_to_vector(model.parameters()).detach().numpy()
+        with self._lock:
+            np.frombuffer(self._raw, dtype=np.float32)[:] = flat
+            self._version.value = version
+
+    @property
+    def version(self):
+        return self._version.value
+
+    def load_into(self, model):
+        """
+        Copy the published weights into model; returns their version.
+        """
+        with self._lock:
+            flat = np.frombuffer(self._raw, dtype=np.float32).copy()
+            version = self._version.value
+        vector_to_parameters(torch.from_numpy(flat), model.parameters())
+        return version
+
+
+def actor_epsilon(actor_id, num_actors, base=0.4, alpha=7.0):
+    """
+    Fixed exploration rate per actor, spread from base down to base^(1+alpha).
+    """
+    if num_actors == 1:
+        return base
+    return base ** (1 + alpha * actor_id / (num_actors - 1))
+
+
+def _actor(actor_id, num_actors, memory, board, stats, stop, num_envs, sync_every,
+           seed, agent_seat, obs_version, turn_cap):
+    """
+    Actor process: steps num_envs games with its copy of the policy and
+    streams the transitions into the shared memory.
+    """
+    torch.set_num_threads(1)
+    np.random.seed(game_seed(seed, -1 - actor_id) % 2**32)
+    env = BangVectorEnv(num_envs, agent_seat=agent_seat, seed=game_seed(seed, actor_id),
+                        turn_cap=turn_cap, obs_version=obs_version)
+    agent = DQNAgent(state_size(obs_version), NUM_ACTIONS, memory_size=1,
+                     epsilon=actor_epsilon(actor_id, num_actors))
+    stats[2 * actor_id + 1] = board.load_into(agent.model)
+
+    states, masks = env.reset()
+    steps = 0
+    while not stop.is_set():
+        actions = agent.act_batch(states, masks)
+        next_states, masks, rewards, dones = env.step(actions)
+        memory.push_batch(states, actions, rewards, next_states, dones)
+        states = next_states
+        steps += 1
+        stats[2 * actor_id] += num_envs
+        if steps % sync_every == 0 and board.version > stats[2 * actor_id + 1]:
+            stats[2 * actor_id + 1] = board.load_into(agent.model)
+
+
+def run_actor_learner(num_actors=None, envs_per_actor=8, updates=2000, batch_size=64,
+                      memory_size=100000, warmup=1000, publish_every=50, sync_every=20,
+                      seed=None, agent_seat=0, obs_version=1, turn_cap=100, lr=0.001,
+                      report_every=5.0, verbose=True):
+    """
+    Train a DQNAgent with num_actors actor processes generating experience
+    (each stepping envs_per_actor games through BangVectorEnv) while this
+    process learns:
+      - actors write transitions into a SharedReplayMemory
+      - the learner runs `updates` DQNAgent.replay steps on it and
+        publishes its weights every publish_every updates
+      - actors pick up new weights every sync_every vector steps
+
+    Returns (agent, stats) where stats holds actor steps/sec, learner
+    updates/sec and the mean policy lag (learner updates since the weights
+    each actor is acting with were published, averaged over every update).
+    """
+    num_actors = num_actors or max(1, (os.cpu_count() or 2) - 1)
+    seed = int.from_bytes(os.urandom(8), "little") if seed is None else seed
+    ctx = mp.get_context()
+
+    agent = DQNAgent(state_size(obs_version), NUM_ACTIONS, lr=lr)
+    memory = SharedReplayMemory(memory_size, state_size(obs_version), ctx=ctx)
+    agent.memory = memory
+    board = WeightBoard(agent.model, ctx=ctx)
+    board.publish(agent.model, 0)
+    # per actor: transitions produced, weight version in use
+    stats = ctx.RawArray("q", 2 * num_actors)
+    stop = ctx.Event()
+
+    actors = [
+        ctx.Process(target=_actor, daemon=True,
+                    args=(i, num_actors, memory, board, stats, stop, envs_per_actor,
+                          sync_every, seed, agent_seat, obs_version, turn_cap))
+        for i in range(num_actors)
+    ]
+    for a in actors:
+        a.start()
+
+    def actor_steps():
+        return sum(stats[2 * i] for i in range(num_actors))
+
+    def policy_lag(done):
+        return sum(done - stats[2 * i + 1] for i in range(num_actors)) / num_actors
+
+    try:
+        while len(memory) < max(warmup, batch_size):
+            if not any(a.is_alive() for a in actors):
+                raise RuntimeError("all actor processes exited before the replay warmup")
+            time.sleep(0.05)
+
+        start = time.perf_counter()
+        steps_at_start = actor_steps()
+        last_report = start
+        lag_total = 0.0
+        done = 0
+        while done < updates:
+            agent.replay(batch_size)
+            done += 1
+            # sampled every update, before publishing => the time-averaged
+            # staleness of the weights the actors are acting with
+            lag_total += policy_lag(done)
+            if done % publish_every == 0:
+                board.publish(agent.model, done)
+            now = time.perf_counter()
+            if verbose and now - last_report >= report_every:
+                elapsed = now - start
+                print(f"[{elapsed:6.1f}s] actor steps/sec {(actor_steps() - steps_at_start) / elapsed:.0f}, "
+                      f"updates/sec {done / elapsed:.1f}, policy lag {policy_lag(done):.1f} updates")
+                last_report = now
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        for a in actors:
+            a.join(timeout=5)
+            if a.is_alive():
+                a.terminate()
+
+    result = {
+        "actors": num_actors,
+        "actor_steps": actor_steps(),
+        "actor_steps_per_sec": (actor_steps() - steps_at_start) / elapsed,
+        "updates": done,
+        "updates_per_sec": done / elapsed,
+        "mean_policy_lag": lag_total / done if done else 0.0,
+        "elapsed": elapsed,
+    }
+    return agent, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actor-learner DQN training on BangGame.")
+    parser.add_argument("--actors", type=int, default=None)
+    parser.add_argument("--envs-per-actor", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--memory-size", type=int, default=100000)
+    parser.add_argument("--publish-every", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--obs-version", type=int, default=1)
+    args = parser.parse_args()
+
+    _, result = run_actor_learner(num_actors=args.actors, envs_per_actor=args.envs_per_actor,
+                                  updates=args.updates, batch_size=args.batch_size,
+                                  memory_size=args.memory_size, publish_every=args.publish_every,
+                                  seed=args.seed, obs_version=args.obs_version)
+    print(f"{result['actors']} actors: {result['actor_steps_per_sec']:.0f} actor steps/sec, "
+          f"{result['updates_per_sec']:.1f} learner updates/sec, "
+          f"mean policy lag {result['mean_policy_lag']:.1f} updates")
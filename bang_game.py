@@ -1,12 +1,90 @@
 # bang_game.py
 
 import random
-from enums import Role, Suit, Value
-from deck import Deck
+from collections import namedtuple
+from enums import Role, Suit, Value, LogLevel, Faction
+from deck import Deck, CARD_SUITS, CARD_VALUES, CARD_NAME_CODES, CARD_DISPLAY
+from card import BANG, MISSED, CARD_NAMES
 from player import Player
 from character_data import CHARACTERS
-from distance import effective_distance
+from distance import DistanceCache
 from game_logger import GameLogger
+from rng import make_rng, rng_from_state
+from zobrist import (DECK_KEYS, DISCARD_KEYS, HEALTH_KEYS, ELIMINATED_KEYS, JAIL_KEYS,
+                     DYNAMITE_KEYS, BANG_USED_KEYS, CURRENT_KEYS, HAND_SIZE_KEYS,
+                     DECK_SIZE_KEYS, OBSERVER_KEYS, public_hash, full_hash)
+
+# Compact, flat copy of everything that changes during a game (see BangGame.snapshot).
+# players: one tuple per seat, laid out as PLAYER_FIELDS (hand: Hand.getstate()).
+# env_seat / env_pending / obs_version: the step() seat and whether its
+# play-phase decision is pending.
+GameSnapshot = namedtuple("GameSnapshot", [
+    "game_number",
+    "players",
+    "deck",
+    "discard",
+    "turn_count",
+    "current_player_idx",
+    "eliminated_turn",
+    "cards_in_hand_start",
+    "last_damage_turn",
+    "elimination_order",
+    "env_seat",
+    "env_pending",
+    "obs_version",
+    "rng_state",
+])
+
+PLAYER_FIELDS = (
+    "player_id", "role", "character_name", "max_health",
+    "health", "eliminated", "hand", "weapon", "mustang", "scope", "barrel",
+    "in_jail", "dynamite", "bang_used_this_turn", "skipped_play",
+)
+
+# Play-phase actions (legal_actions / apply_action):
+#   ACTION_PASS                => end the play phase
+#   ACTION_BANG + seat         => play a Bang! at that seat
+#   ACTION_CARD + name_code    => play (discard) a card of that type, any but Bang!
+ACTION_PASS = 0
+ACTION_BANG = 1
+ACTION_CARD = ACTION_BANG + 5
+NUM_ACTIONS = ACTION_CARD + len(CARD_NAMES)
+
+WINNER_MESSAGES = {
+    Faction.RENEGADE: "Renegade wins!",
+    Faction.OUTLAWS: "Outlaws win!",
+    Faction.SHERIFF_DEPUTIES: "Sheriff and Deputies win!",
+    Faction.NONE: "No final official outcome (possibly ended early).",
+    Faction.CAPPED: "Capped: no winner within the turn / stall limit.",
+}
+
+# _winner() => roles that win
+WINNING_ROLES = {
+    Faction.RENEGADE: (Role.RENEGADE,),
+    Faction.OUTLAWS: (Role.OUTLAW,),
+    Faction.SHERIFF_DEPUTIES: (Role.SHERIFF, Role.DEPUTY),
+    Faction.NONE: (),
+    Faction.CAPPED: (),
+}
+
+
+class GameResult(namedtuple("GameResult", [
+    "winner",             # enums.Faction
+    "turns",
+    "survived_turns",     # per seat, see BangGame.player_survived_turns
+    "elimination_order",  # seats in the order they were eliminated
+])):
+    """
+    What run_game() returns once a game is over.
+    """
+    __slots__ = ()
+
+    @property
+    def message(self):
+        return WINNER_MESSAGES[self.winner]
+
+    def won(self, role):
+        return role in WINNING_ROLES[self.winner]
 
 class BangGame:
     """
@@ -19,17 +97,57 @@ class BangGame:
           4 => Deputy
       - Thoroughly logs CardName, TargetID, HP_Before, HP_After, etc., 
         so missing data is minimized.
-      - Each player's final GameResult is logged (Win, Loss, NoOutcome).
+      - Each player's final GameResult is logged (Win, Loss, NoOutcome,
+        or Capped for everyone when a turn / stall limit ended the game).
+
+    log_level (enums.LogLevel) picks which events reach the logger:
+    OFF, OUTCOMES (GameOver rows), TURNS (+ TurnEnd/Eliminate) or FULL.
+    Skipped events never build their arguments.
+
+    Every random decision (characters, shuffles, targets, discards) goes
+    through self.rng, built from seed or rng (a random.Random or a
+    numpy.random.Generator). The same seed always replays the same game.
+
+    snapshot()/restore() copy the game state (players, hands, equipment,
+    deck order, discard pile, turn counters, RNG state) without the logger;
+    clone() / BangGame.from_snapshot() build an unlogged copy to branch from.
+
+    agents maps seats to objects with choose_action(game, player) -> action
+    (see ACTION_*); those seats make their own play-phase decisions,
+    everyone else plays their cards in random order.
+
+    state_hash is a 64-bit Zobrist hash of the game state (card locations,
+    health, eliminations, equipment, jail/dynamite, Bang!s used, current
+    player), XOR-updated as the state changes; observation_hash(seat) covers
+    only what that seat can see. debug_hash=True checks the running hash
+    against a full recomputation at every read and at the end of every turn.
+
+    reset()/step(action) drive the game one decision at a time, Gym style:
+    the seat given to reset() is controlled by the caller, every other seat
+    plays as in run_game, and control comes back at each of that seat's
+    play-phase decisions with (observation, legal-action mask, reward, done).
     """
 
-    def __init__(self, verbose=False, logger=None, game_number=1):
+    def __init__(self, verbose=False, logger=None, game_number=1, log_level=LogLevel.FULL,
+                 seed=None, rng=None, agents=None, debug_hash=False):
         self.num_players = 5
         self.verbose = verbose
         self.game_number = game_number
-
-        # If no logger is provided, create a default that APPENDS data to bang_log.csv
-        self.logger = logger if logger else GameLogger(filename="bang_log.csv")
-
+        self.seed = seed
+        self.rng = make_rng(rng if rng is not None else seed)
+        self._set_logging(log_level, logger)
+        self.agents = agents or {}
+        self.debug_hash = debug_hash
+        self.env_seat = None
+        self.obs_version = 1
+        self.max_turns = None
+        self.stall_rounds = None
+        self._new_game()
+
+    def _new_game(self):
+        """
+        Deal a fresh game with self.rng.
+        """
         # Hard-code the roles => no duplicates
         # [Sheriff(0), Renegade(1), Outlaw(2), Outlaw(3), Deputy(4)]
         self.roles = [
@@ -41,8 +159,8 @@ class BangGame:
         ]
 
         # Pick 5 unique characters
-        chosen_chars = random.sample(CHARACTERS, 5)
-        # random.shuffle(chosen_chars) # if you want seat-based randomization
+        chosen_chars = self.rng.sample(CHARACTERS, 5)
+        # self.rng.shuffle(chosen_chars) # if you want seat-based randomization
 
         self.players = []
         for i in range(5):
@@ -55,17 +173,41 @@ class BangGame:
             )
             self.players.append(p)
 
-        self.deck = Deck()
+        self.deck = Deck(rng=self.rng, zkeys=(DECK_KEYS, DISCARD_KEYS))
         self.deck.shuffle()
 
         self.turn_count = 0
         self.current_player_idx = 0
-
-        # track how many total turns each player survived
-        self.player_survived_turns = [0]*5
+        self.game_over = False
+        self.capped = False
+        self.outcome = None
+        self._cards_in_hand_start = 0
+        self._last_damage_turn = 0
+        self._env_player = None
+        self.elimination_order = []
+
+        # live counters, only touched when someone is eliminated:
+        # alive players per role, and the turn each seat was eliminated in
+        self.alive_by_role = {role: 0 for role in Role}
+        for role in self.roles:
+            self.alive_by_role[role] += 1
+        self.alive_count = 5
+        self.eliminated_turn = [None]*5
 
         self._setup_game()
 
+    def _set_logging(self, log_level, logger):
+        self.log_level = LogLevel(log_level)
+        self._log_outcomes = self.log_level >= LogLevel.OUTCOMES
+        self._log_turns = self.log_level >= LogLevel.TURNS
+        self._log_full = self.log_level >= LogLevel.FULL
+
+        # If no logger is provided, create a default that APPENDS data to bang_log.csv
+        if self.log_level == LogLevel.OFF:
+            self.logger = None
+        else:
+            self.logger = logger if logger else GameLogger(filename="bang_log.csv")
+
     def _setup_game(self):
         """
         Deal initial cards = player's HP, set flags for Paul Regret, etc.
@@ -73,7 +215,7 @@ class BangGame:
         for p in self.players:
             for _ in range(p.health):
                 c = self.deck.draw()
-                if c:
+                if c is not None:
                     p.hand.append(c)
 
         for p in self.players:
@@ -84,138 +226,294 @@ class BangGame:
             if p.character_name == "Jourdonnais":
                 p.barrel += 1
 
-    def run_game(self):
+        # distances only change on elimination / equipment => cache them
+        self.distances = DistanceCache(self.players)
+        # hash of the per-player state + current player; the piles keep their own
+        self._public_hash = public_hash(self)
+
+    def run_game(self, max_turns=None, stall_rounds=None):
         """
         Runs the game to completion, ensuring consistent role distribution
         and thorough logging for minimal missing data.
+
+        max_turns / stall_rounds (if given) replace self.max_turns /
+        self.stall_rounds: the game is cut off before turn max_turns + 1, or
+        once nobody has taken damage for stall_rounds rounds (a round = one
+        turn per alive player). A cut-off game ends Capped (self.capped).
+
+        Returns a GameResult (also kept in self.outcome); the GameOver rows
+        are logged once, however often run_game() is called.
         """
-        while True:
-            current_player = self.players[self.current_player_idx]
-            if current_player.eliminated:
-                self._next_player()
-                if self._check_end_game():
-                    break
+        if self.outcome is not None:
+            return self.outcome
+        if max_turns is not None:
+            self.max_turns = max_turns
+        if stall_rounds is not None:
+            self.stall_rounds = stall_rounds
+        if self._env_player is not None:
+            # a step() turn is pending => finish it with random play
+            player, self._env_player = self._env_player, None
+            self._play_phase(player)
+            self._end_turn(player)
+        while not self.game_over:
+            if self._cap_reached():
+                break
+            player = self._begin_turn()
+            if player is None:
                 continue
+            if player.player_id in self.agents:
+                self._agent_play_phase(player)
+            else:
+                self._play_phase(player)
+            self._end_turn(player)
 
-            self.turn_count += 1
-            # Everyone alive => survived 1 more turn
-            for idx, p in enumerate(self.players):
-                if not p.eliminated:
-                    self.player_survived_turns[idx]+=1
-
-            # store #cards at start
-            cards_in_hand_start = len(current_player.hand)
-
-            # handle dynamite
-            if current_player.dynamite:
-                self._handle_dynamite(current_player)
-                if current_player.eliminated:
-                    if self._check_end_game():
-                        break
-                    self._next_player()
-                    continue
-
-            # handle jail
-            if current_player.in_jail and current_player.role != Role.SHERIFF:
-                self._handle_jail(current_player)
-                if current_player.eliminated:
-                    if self._check_end_game():
-                        break
-                    self._next_player()
-                    continue
-                if getattr(current_player,"skipped_play",False):
-                    current_player.skipped_play=False
-                    self._discard_phase(current_player, cards_in_hand_start)
-                    if self._check_end_game():
-                        break
-                    self._next_player()
-                    continue
+        return self._finish_game()
 
-            # draw
-            self._draw_phase(current_player)
+    def _cap_reached(self):
+        """
+        Between turns: end the game as Capped if the turn budget is spent or
+        the game has stalled.
+        """
+        capped = ((self.max_turns is not None and self.turn_count >= self.max_turns)
+                  or (self.stall_rounds is not None
+                      and self.turn_count - self._last_damage_turn >= self.stall_rounds * self.alive_count))
+        if capped:
+            self.capped = self.game_over = True
+        return capped
 
-            # play
-            self._play_phase(current_player)
+    #########################
+    # STEP API
+    #########################
+    def reset(self, seed=None, agent_seat=0, game_number=None, obs_version=1, observe=True,
+              max_turns=None, stall_rounds=None):
+        """
+        Deal a new game (from seed if given: reset(seed=s) deals the same
+        game as BangGame(seed=s)) and play until agent_seat's first decision.
+        Returns (observation, action mask); if the game ends before that
+        seat ever gets to act, self.game_over is already True.
+        obs_version picks the state_encoder feature layout; observe=False
+        skips building the observation (returns (None, None)) for callers
+        that encode into their own buffers.
+        max_turns / stall_rounds cap the game as in run_game().
+        """
+        if not 0 <= agent_seat < self.num_players:
+            raise ValueError(f"agent_seat must be in 0..{self.num_players - 1}, got {agent_seat}")
+        if seed is not None:
+            self.seed = seed
+            self.rng = make_rng(seed)
+        if game_number is not None:
+            self.game_number = game_number
+        self.env_seat = agent_seat
+        self.obs_version = obs_version
+        self.max_turns = max_turns
+        self.stall_rounds = stall_rounds
+        self._new_game()
+        self._advance()
+        return self._observe() if observe else (None, None)
+
+    def step(self, action, observe=True):
+        """
+        Take action (see ACTION_*) for the seat given to reset() and play on
+        until its next decision or the end of the game.
+        Returns (observation, action mask, reward, done); the reward is
+        +1 / -1 when the seat's side wins / loses, 0 otherwise (also when
+        the game ends Capped).
+        """
+        player = self._env_player
+        if player is None:
+            raise ValueError("no decision pending: call reset() first" if self.env_seat is None
+                             else "game is over: call reset()")
+        if action == ACTION_PASS:
+            self._env_player = None
+            self._end_turn(player)
+        else:
+            self.apply_action(player, action)
+        self._advance()
 
-            # discard
-            self._discard_phase(current_player, cards_in_hand_start)
+        reward = 0.0
+        if self.game_over and not self.capped:
+            reward = 1.0 if self.outcome.won(self.players[self.env_seat].role) else -1.0
+        obs, mask = self._observe() if observe else (None, None)
+        return obs, mask, reward, self.game_over
 
-            if self._check_end_game():
+    def _advance(self):
+        """
+        Play on until the env seat has a real choice (more than passing)
+        or the game is over.
+        """
+        while not self.game_over:
+            player = self._env_player
+            if player is not None:
+                if self._check_end_game() or self.legal_actions(player) == [ACTION_PASS]:
+                    self._env_player = None
+                    self._end_turn(player)
+                    continue
+                return
+            if self._cap_reached():
                 break
+            player = self._begin_turn()
+            if player is None:
+                continue
+            if player.player_id == self.env_seat:
+                self._env_player = player
+            elif player.player_id in self.agents:
+                self._agent_play_phase(player)
+                self._end_turn(player)
+            else:
+                self._play_phase(player)
+                self._end_turn(player)
+        if self.outcome is None:
+            self._finish_game()
+
+    def legal_action_list(self):
+        """
+        Legal actions of the pending step() decision ([] if none).
+        """
+        if self._env_player is None:
+            return []
+        return self.legal_actions(self._env_player)
+
+    def _observe(self):
+        from state_encoder import encode_game, action_mask
+        return (encode_game(self, self.obs_version, self.env_seat),
+                action_mask(self.legal_action_list()))
+
+    def _begin_turn(self):
+        """
+        Start the current player's turn: dynamite, jail, draw phase.
+        Returns the player if they go on to the play phase, None if the turn
+        is already over (self.game_over says whether the game ended).
+        """
+        current_player = self.players[self.current_player_idx]
+        if current_player.eliminated:
             self._next_player()
+            self.game_over = self._check_end_game()
+            return None
+
+        self.turn_count += 1
 
-        return self._print_winner()
+        # store #cards at start
+        self._cards_in_hand_start = len(current_player.hand)
+
+        # handle dynamite
+        if current_player.dynamite:
+            self._handle_dynamite(current_player)
+            if current_player.eliminated:
+                self.game_over = self._check_end_game()
+                if not self.game_over:
+                    self._next_player()
+                return None
+
+        # handle jail
+        if current_player.in_jail and current_player.role != Role.SHERIFF:
+            self._handle_jail(current_player)
+            if current_player.eliminated:
+                self.game_over = self._check_end_game()
+                if not self.game_over:
+                    self._next_player()
+                return None
+            if getattr(current_player,"skipped_play",False):
+                current_player.skipped_play=False
+                self._end_turn(current_player)
+                return None
+
+        # draw
+        self._draw_phase(current_player)
+        used=BANG_USED_KEYS[current_player.player_id]
+        self._public_hash ^= used[current_player.bang_used_this_turn] ^ used[0]
+        current_player.bang_used_this_turn=0
+        return current_player
+
+    def _end_turn(self, player):
+        """
+        Discard phase, end-of-game check, hand over to the next player.
+        """
+        self._discard_phase(player, self._cards_in_hand_start)
+        self.game_over = self._check_end_game()
+        if not self.game_over:
+            self._next_player()
+        if self.debug_hash:
+            self.check_hash()
+        return self.game_over
 
     ###############################
     # DYNAMITE / JAIL
     ###############################
     def _handle_dynamite(self, player):
         c = self._draw_for_draw_check(player)
-        if not c:
+        if c is None:
             return
 
         hp_before = player.health
-        if c.suit==Suit.SPADES and Value.TWO.value <= c.value.value <= Value.NINE.value:
+        if CARD_SUITS[c]==Suit.SPADES and Value.TWO.value <= CARD_VALUES[c] <= Value.NINE.value:
             hp_after = hp_before - 3
-            self.logger.log_event(
-                game_id=self.game_number,
-                turn_in_game=self.turn_count,
-                player_id=player.player_id,
-                role=player.role.name,
-                character=player.character_name,
-                action="DynamiteExplode",
-                card_name="Dynamite",
-                hp_before=hp_before,
-                hp_after=hp_after,
-                damage_dealt=3
-            )
+            if self._log_full:
+                self.logger.log_event(
+                    game_id=self.game_number,
+                    turn_in_game=self.turn_count,
+                    player_id=player.player_id,
+                    role=player.role.name,
+                    character=player.character_name,
+                    action="DynamiteExplode",
+                    card_name="Dynamite",
+                    hp_before=hp_before,
+                    hp_after=hp_after,
+                    damage_dealt=3
+                )
             self._apply_damage(player, 3, None)
             player.dynamite=False
+            self._public_hash ^= DYNAMITE_KEYS[player.player_id]
         else:
             # pass left
             player.dynamite=False
+            self._public_hash ^= DYNAMITE_KEYS[player.player_id]
             nxt=(player.player_id+1)%5
             while self.players[nxt].eliminated:
                 nxt=(nxt+1)%5
-            self.players[nxt].dynamite=True
-            self.logger.log_event(
-                game_id=self.game_number,
-                turn_in_game=self.turn_count,
-                player_id=player.player_id,
-                role=player.role.name,
-                character=player.character_name,
-                action="DynamitePass",
-                card_name="Dynamite",
-                target_id=nxt
-            )
+            if not self.players[nxt].dynamite:
+                self.players[nxt].dynamite=True
+                self._public_hash ^= DYNAMITE_KEYS[nxt]
+            if self._log_full:
+                self.logger.log_event(
+                    game_id=self.game_number,
+                    turn_in_game=self.turn_count,
+                    player_id=player.player_id,
+                    role=player.role.name,
+                    character=player.character_name,
+                    action="DynamitePass",
+                    card_name="Dynamite",
+                    target_id=nxt
+                )
 
     def _handle_jail(self, player):
         c=self._draw_for_draw_check(player)
-        if not c:
+        if c is None:
             return
-        if c.suit==Suit.HEARTS:
-            player.in_jail=False
-            self.logger.log_event(
-                game_id=self.game_number,
-                turn_in_game=self.turn_count,
-                player_id=player.player_id,
-                role=player.role.name,
-                character=player.character_name,
-                action="JailEscape",
-                card_name="Jail"
-            )
+        player.in_jail=False
+        self._public_hash ^= JAIL_KEYS[player.player_id]
+        if CARD_SUITS[c]==Suit.HEARTS:
+            if self._log_full:
+                self.logger.log_event(
+                    game_id=self.game_number,
+                    turn_in_game=self.turn_count,
+                    player_id=player.player_id,
+                    role=player.role.name,
+                    character=player.character_name,
+                    action="JailEscape",
+                    card_name="Jail"
+                )
         else:
-            player.in_jail=False
             player.skipped_play=True
-            self.logger.log_event(
-                game_id=self.game_number,
-                turn_in_game=self.turn_count,
-                player_id=player.player_id,
-                role=player.role.name,
-                character=player.character_name,
-                action="JailSkip",
-                card_name="Jail"
-            )
+            if self._log_full:
+                self.logger.log_event(
+                    game_id=self.game_number,
+                    turn_in_game=self.turn_count,
+                    player_id=player.player_id,
+                    role=player.role.name,
+                    character=player.character_name,
+                    action="JailSkip",
+                    card_name="Jail"
+                )
 
     #########################
     # DRAW / PLAY / DISCARD
@@ -223,58 +521,58 @@ class BangGame:
     def _draw_phase(self, player):
         for _ in range(2):
             c = self.deck.draw()
-            if c:
+            if c is not None:
                 player.hand.append(c)
-                self.logger.log_event(
-                    game_id=self.game_number,
-                    turn_in_game=self.turn_count,
-                    player_id=player.player_id,
-                    role=player.role.name,
-                    character=player.character_name,
-                    action="Draw",
-                    card_name=str(c)
-                )
+                if self._log_full:
+                    self.logger.log_event(
+                        game_id=self.game_number,
+                        turn_in_game=self.turn_count,
+                        player_id=player.player_id,
+                        role=player.role.name,
+                        character=player.character_name,
+                        action="Draw",
+                        card_name=CARD_DISPLAY[c]
+                    )
 
     def _play_phase(self, player):
         if getattr(player,"skipped_play",False):
             return
-        player.bang_used_this_turn=0
-        local_hand = list(player.hand)
-        random.shuffle(local_hand)
-        for card in local_hand:
-            if card in player.hand:
+        # try every card once in random order, drawing straight from the hand:
+        # played cards leave it, so only Bang!s without a target get redrawn
+        hand = player.hand
+        kept = set()
+        while len(hand) > len(kept):
+            card = hand.choice(self.rng)
+            if card not in kept:
                 self._attempt_play_card(player, card)
+                if card in hand:
+                    kept.add(card)
+
+    def _log_play_card(self, player, card):
+        if self._log_full:
+            self.logger.log_event(
+                game_id=self.game_number,
+                turn_in_game=self.turn_count,
+                player_id=player.player_id,
+                role=player.role.name,
+                character=player.character_name,
+                action="PlayCard",
+                card_name=CARD_DISPLAY[card]
+            )
 
     def _attempt_play_card(self, player, card):
-        self.logger.log_event(
-            game_id=self.game_number,
-            turn_in_game=self.turn_count,
-            player_id=player.player_id,
-            role=player.role.name,
-            character=player.character_name,
-            action="PlayCard",
-            card_name=str(card)
-        )
-        if card.name=="Bang!":
-            if (player.weapon!="Volcanic"
-                and player.character_name!="Willy the Kid"
-                and player.bang_used_this_turn>=1):
-                return
-            rng=self._weapon_range(player.weapon)
-            candidates=[]
-            for t in self.players:
-                if t!=player and not t.eliminated:
-                    dist=effective_distance(self,player,t)
-                    if dist<=rng:
-                        candidates.append(t)
+        self._log_play_card(player, card)
+        name=CARD_NAME_CODES[card]
+        if name==BANG:
+            candidates=self._bang_targets(player)
             if not candidates:
                 return
-            target = random.choice(candidates)
+            target = self.players[self.rng.choice(candidates)]
             player.hand.remove(card)
             self.deck.discard(card)
             self._play_bang(player, target, card)
-            player.bang_used_this_turn+=1
-        elif card.name=="Missed!":
+            self._count_bang(player)
+        elif name==MISSED:
             player.hand.remove(card)
             self.deck.discard(card)
         else:
@@ -282,81 +580,156 @@ class BangGame:
             player.hand.remove(card)
             self.deck.discard(card)
 
+    def _bang_targets(self, player):
+        """
+        Seats player may fire a Bang! at right now (empty once the
+        one-Bang!-per-turn limit is used up).
+        """
+        if (player.weapon!="Volcanic"
+            and player.character_name!="Willy the Kid"
+            and player.bang_used_this_turn>=1):
+            return ()
+        return self.distances.reachable(player.player_id, self._weapon_range(player.weapon))
+
+    #########################
+    # PLAY-PHASE DECISIONS
+    #########################
+    def legal_actions(self, player):
+        """
+        Actions (ACTION_*) player may take now in their play phase.
+        """
+        actions=[ACTION_PASS]
+        hand=player.hand
+        if hand.has_type(BANG):
+            for seat in self._bang_targets(player):
+                actions.append(ACTION_BANG+seat)
+        for code in hand.types():
+            if code!=BANG:
+                actions.append(ACTION_CARD+code)
+        return actions
+
+    def apply_action(self, player, action):
+        """
+        Play one card as chosen by an agent (ACTION_PASS does nothing).
+        """
+        if action==ACTION_PASS:
+            return
+        if ACTION_BANG<=action<ACTION_CARD:
+            seat=action-ACTION_BANG
+            if not player.hand.has_type(BANG) or seat not in self._bang_targets(player):
+                raise ValueError(f"Illegal action {action}: no Bang! at seat {seat} for player {player.player_id}")
+            card=player.hand.remove_type(BANG)
+            self._log_play_card(player, card)
+            self.deck.discard(card)
+            self._play_bang(player, self.players[seat], card)
+            self._count_bang(player)
+        elif ACTION_CARD<action<NUM_ACTIONS and player.hand.has_type(action-ACTION_CARD):
+            card=player.hand.remove_type(action-ACTION_CARD)
+            self._log_play_card(player, card)
+            self.deck.discard(card)
+        else:
+            raise ValueError(f"Illegal action {action} for player {player.player_id}")
+
+    def _agent_play_phase(self, player):
+        agent=self.agents[player.player_id]
+        while not self._check_end_game():
+            action=agent.choose_action(self, player)
+            if action==ACTION_PASS:
+                break
+            self.apply_action(player, action)
+
     def _play_bang(self, player, target, card):
         hp_before=target.health
         hp_after=hp_before-1
-        self.logger.log_event(
-            game_id=self.game_number,
-            turn_in_game=self.turn_count,
-            player_id=player.player_id,
-            role=player.role.name,
-            character=player.character_name,
-            action="Bang",
-            card_name=str(card),
-            target_id=target.player_id,
-            hp_before=hp_before,
-            hp_after=hp_after,
-            damage_dealt=1,
-            aggressive_action=1
-        )
+        if self._log_full:
+            self.logger.log_event(
+                game_id=self.game_number,
+                turn_in_game=self.turn_count,
+                player_id=player.player_id,
+                role=player.role.name,
+                character=player.character_name,
+                action="Bang",
+                card_name=CARD_DISPLAY[card],
+                target_id=target.player_id,
+                hp_before=hp_before,
+                hp_after=hp_after,
+                damage_dealt=1,
+                aggressive_action=1
+            )
         self._apply_damage(target,1,player)
 
+    def _count_bang(self, player):
+        used=BANG_USED_KEYS[player.player_id]
+        n=player.bang_used_this_turn
+        self._public_hash ^= used[n] ^ used[n+1]
+        player.bang_used_this_turn=n+1
+
     def _apply_damage(self, target, amount, source):
+        was_alive=not target.eliminated
         hp_before=target.health
         target.take_damage(amount)
         hp_after=target.health
-        self.logger.log_event(
-            game_id=self.game_number,
-            turn_in_game=self.turn_count,
-            player_id=(source.player_id if source else -1),
-            role=(source.role.name if source else "Env"),
-            character=(source.character_name if source else "None"),
-            action="Damage",
-            target_id=target.player_id,
-            hp_before=hp_before,
-            hp_after=hp_after,
-            damage_dealt=amount,
-            aggressive_action=1 if source and source!=target else 0
-        )
-        if target.eliminated:
+        if amount > 0:
+            self._last_damage_turn=self.turn_count
+        health=HEALTH_KEYS[target.player_id]
+        self._public_hash ^= health[hp_before] ^ health[hp_after]
+        if self._log_full:
             self.logger.log_event(
                 game_id=self.game_number,
                 turn_in_game=self.turn_count,
                 player_id=(source.player_id if source else -1),
                 role=(source.role.name if source else "Env"),
                 character=(source.character_name if source else "None"),
-                action="Eliminate",
-                target_id=target.player_id
+                action="Damage",
+                target_id=target.player_id,
+                hp_before=hp_before,
+                hp_after=hp_after,
+                damage_dealt=amount,
+                aggressive_action=1 if source and source!=target else 0
             )
+        if target.eliminated and was_alive:
+            self._on_eliminated(target)
+            if self._log_turns:
+                self.logger.log_event(
+                    game_id=self.game_number,
+                    turn_in_game=self.turn_count,
+                    player_id=(source.player_id if source else -1),
+                    role=(source.role.name if source else "Env"),
+                    character=(source.character_name if source else "None"),
+                    action="Eliminate",
+                    target_id=target.player_id
+                )
 
     def _discard_phase(self, player, cards_in_hand_start):
         if len(player.hand)>player.health:
             excess=len(player.hand)-player.health
-            discards=random.sample(player.hand,excess)
+            discards=player.hand.sample(excess,self.rng)
             for c in discards:
                 player.hand.remove(c)
                 self.deck.discard(c)
-                self.logger.log_event(
-                    game_id=self.game_number,
-                    turn_in_game=self.turn_count,
-                    player_id=player.player_id,
-                    role=player.role.name,
-                    character=player.character_name,
-                    action="Discard",
-                    card_name=str(c)
-                )
+                if self._log_full:
+                    self.logger.log_event(
+                        game_id=self.game_number,
+                        turn_in_game=self.turn_count,
+                        player_id=player.player_id,
+                        role=player.role.name,
+                        character=player.character_name,
+                        action="Discard",
+                        card_name=CARD_DISPLAY[c]
+                    )
         cards_in_hand_end = len(player.hand)
         # TurnEnd event => logs the final hand count
-        self.logger.log_event(
-            game_id=self.game_number,
-            turn_in_game=self.turn_count,
-            player_id=player.player_id,
-            role=player.role.name,
-            character=player.character_name,
-            action="TurnEnd",
-            cards_in_hand_start=cards_in_hand_start,
-            cards_in_hand_end=cards_in_hand_end
-        )
+        if self._log_turns:
+            self.logger.log_event(
+                game_id=self.game_number,
+                turn_in_game=self.turn_count,
+                player_id=player.player_id,
+                role=player.role.name,
+                character=player.character_name,
+                action="TurnEnd",
+                cards_in_hand_start=cards_in_hand_start,
+                cards_in_hand_end=cards_in_hand_end
+            )
 
     ###########################
     # NEXT_PLAYER, ENDGAME
@@ -365,27 +738,38 @@ class BangGame:
         nxt=(self.current_player_idx+1)%5
         for _ in range(5):
             if not self.players[nxt].eliminated:
+                self._public_hash ^= CURRENT_KEYS[self.current_player_idx] ^ CURRENT_KEYS[nxt]
                 self.current_player_idx=nxt
                 return
             nxt=(nxt+1)%5
 
+    def _on_eliminated(self, player):
+        self._public_hash ^= ELIMINATED_KEYS[player.player_id]
+        self.alive_by_role[player.role] -= 1
+        self.alive_count -= 1
+        self.eliminated_turn[player.player_id] = self.turn_count
+        self.elimination_order.append(player.player_id)
+        self.distances.refresh()
+
+    @property
+    def player_survived_turns(self):
+        """
+        Turns each seat was alive for: alive seats have survived every turn
+        so far, eliminated ones up to (and including) the turn they fell in.
+        """
+        return [self.turn_count if t is None else t for t in self.eliminated_turn]
+
     def _check_end_game(self):
-        sheriff_alive = any(p.role==Role.SHERIFF and not p.eliminated for p in self.players)
-        outlaws_alive = any(p.role==Role.OUTLAW and not p.eliminated for p in self.players)
-        renegade_alive = any(p.role==Role.RENEGADE and not p.eliminated for p in self.players)
-
-        if not sheriff_alive:
-            alive=[p for p in self.players if not p.eliminated]
-            if len(alive)==1 and alive[0].role==Role.RENEGADE:
-                return True  # renegade alone => renegade wins
-            return True       # else outlaws
-        if sheriff_alive and not outlaws_alive and not renegade_alive:
+        alive = self.alive_by_role
+        if not alive[Role.SHERIFF]:
+            return True       # renegade alone => renegade wins, else outlaws
+        if not alive[Role.OUTLAW] and not alive[Role.RENEGADE]:
             return True       # sheriff/deputies
         return False
 
     def _draw_for_draw_check(self, player):
         c=self.deck.draw()
-        if c:
+        if c is not None:
             self.deck.discard(c)
         return c
 
@@ -397,44 +781,47 @@ class BangGame:
         elif w=="Winchester":return 5
         return 1
 
-    def _print_winner(self):
-        sheriff_alive=any(p.role==Role.SHERIFF and not p.eliminated for p in self.players)
-        outlaws_alive=any(p.role==Role.OUTLAW and not p.eliminated for p in self.players)
-        renegade_alive=any(p.role==Role.RENEGADE and not p.eliminated for p in self.players)
-
-        msg=""
-        if not sheriff_alive:
-            alive=[p for p in self.players if not p.eliminated]
-            if len(alive)==1 and alive[0].role==Role.RENEGADE:
-                msg="Renegade wins!"
-                self._assign_outcomes("RENEGADE")
-            else:
-                msg="Outlaws win!"
-                self._assign_outcomes("OUTLAW")
-        else:
-            if (not outlaws_alive) and (not renegade_alive):
-                msg="Sheriff and Deputies win!"
-                self._assign_outcomes("SH_DEPUTY")
-            else:
-                msg="No final official outcome (possibly ended early)."
-                self._assign_outcomes("NONE")
-        return msg
+    def _winner(self):
+        """
+        The winning Faction, CAPPED if cut off by a limit, NONE while undecided.
+        """
+        if self.capped:
+            return Faction.CAPPED
+        alive=self.alive_by_role
+        if not alive[Role.SHERIFF]:
+            if self.alive_count==1 and alive[Role.RENEGADE]:
+                return Faction.RENEGADE
+            return Faction.OUTLAWS
+        if not alive[Role.OUTLAW] and not alive[Role.RENEGADE]:
+            return Faction.SHERIFF_DEPUTIES
+        return Faction.NONE
+
+    def _finish_game(self):
+        """
+        Log the GameOver rows and store the GameResult in self.outcome.
+        """
+        winner=self._winner()
+        self._assign_outcomes(winner)
+        self.outcome=GameResult(winner, self.turn_count, tuple(self.player_survived_turns),
+                                tuple(self.elimination_order))
+        return self.outcome
 
-    def _assign_outcomes(self, winning_role):
+    def _assign_outcomes(self, winner):
         """
         For each player => logs 'GameOver', ensuring 'GameResult' is NOT missing.
         SurvivedTurns is recorded for each seat.
         """
+        if not self._log_outcomes:
+            return
+        survived_turns=self.player_survived_turns
         for i,p in enumerate(self.players):
             final_res="Loss"
-            if not p.eliminated:
-                if winning_role=="RENEGADE" and p.role==Role.RENEGADE:
-                    final_res="Win"
-                elif winning_role=="OUTLAW" and p.role==Role.OUTLAW:
-                    final_res="Win"
-                elif winning_role=="SH_DEPUTY" and p.role in [Role.SHERIFF,Role.DEPUTY]:
+            if winner==Faction.CAPPED:
+                final_res="Capped"
+            elif not p.eliminated:
+                if p.role in WINNING_ROLES[winner]:
                     final_res="Win"
-                elif winning_role=="NONE":
+                elif winner==Faction.NONE:
                     final_res="NoOutcome"
 
             self.logger.log_event(
@@ -445,5 +832,167 @@ class BangGame:
                 character=p.character_name,
                 action="GameOver",
                 game_result=final_res,
-                survived_turns=self.player_survived_turns[i]
+                survived_turns=survived_turns[i]
             )
+        # game over => push any buffered rows out (loggers only need log_event)
+        flush = getattr(self.logger, "flush", None)
+        if flush is not None:
+            flush()
+
+    ###########################
+    # STATE HASHING
+    ###########################
+    @property
+    def state_hash(self):
+        """
+        64-bit Zobrist hash of the full game state, O(1).
+        """
+        if self.debug_hash:
+            self.check_hash()
+        return self._running_hash()
+
+    def _running_hash(self):
+        h = self._public_hash ^ self.deck.deck_hash ^ self.deck.discard_hash
+        for p in self.players:
+            h ^= p.hand.zhash
+        return h
+
+    def observation_hash(self, seat):
+        """
+        Hash of what the player at seat can see: the public state, the
+        discard pile, their own hand and the sizes of the hidden piles.
+        """
+        if self.debug_hash:
+            self.check_hash()
+        h = (self._public_hash ^ self.deck.discard_hash ^ self.players[seat].hand.zhash
+             ^ OBSERVER_KEYS[seat] ^ DECK_SIZE_KEYS[len(self.deck.cards)])
+        for p in self.players:
+            h ^= HAND_SIZE_KEYS[p.player_id][len(p.hand)]
+        return h
+
+    def check_hash(self):
+        """
+        Compare the running hash with a full recomputation.
+        """
+        expected = full_hash(self)
+        h = self._running_hash()
+        if h != expected:
+            raise RuntimeError(f"state hash out of sync: {h:#018x} != {expected:#018x} "
+                               f"(game {self.game_number}, turn {self.turn_count})")
+
+    ###########################
+    # SNAPSHOT / RESTORE
+    ###########################
+    def snapshot(self):
+        """
+        Capture the game state as a GameSnapshot of flat tuples (no logger).
+        Take it between turns, inside an agent's play phase or while a
+        step() decision is pending (the random play phase keeps some state
+        in locals).
+        """
+        return GameSnapshot(
+            self.game_number,
+            tuple(
+                (p.player_id, p.role, p.character_name, p.max_health,
+                 p.health, p.eliminated, p.hand.getstate(), p.weapon,
+                 p.mustang, p.scope, p.barrel, p.in_jail, p.dynamite,
+                 p.bang_used_this_turn, getattr(p, "skipped_play", False))
+                for p in self.players
+            ),
+            tuple(self.deck.cards),
+            tuple(self.deck.discard_pile),
+            self.turn_count,
+            self.current_player_idx,
+            tuple(self.eliminated_turn),
+            self._cards_in_hand_start,
+            self._last_damage_turn,
+            tuple(self.elimination_order),
+            self.env_seat,
+            self._env_player is not None,
+            self.obs_version,
+            self.rng.getstate(),
+        )
+
+    def restore(self, snap):
+        """
+        Put this game back into the state captured by snapshot(). The game
+        must have the same seats; the logger and log level are left alone.
+        """
+        self.game_number = snap.game_number
+        alive_by_role = {role: 0 for role in Role}
+        alive_count = 0
+        for p, st in zip(self.players, snap.players):
+            (_, p.role, p.character_name, p.max_health,
+             p.health, p.eliminated, hand, p.weapon,
+             p.mustang, p.scope, p.barrel, p.in_jail, p.dynamite,
+             p.bang_used_this_turn, p.skipped_play) = st
+            p.hand.setstate(hand)
+            if not p.eliminated:
+                alive_by_role[p.role] += 1
+                alive_count += 1
+        self.roles = [p.role for p in self.players]
+        self.alive_by_role = alive_by_role
+        self.alive_count = alive_count
+
+        self.deck.set_piles(snap.deck, snap.discard)
+        self.turn_count = snap.turn_count
+        self.current_player_idx = snap.current_player_idx
+        self.eliminated_turn = list(snap.eliminated_turn)
+        self._cards_in_hand_start = snap.cards_in_hand_start
+        self._last_damage_turn = snap.last_damage_turn
+        self.elimination_order = list(snap.elimination_order)
+        self.rng.setstate(snap.rng_state)
+        self.distances.refresh()
+        self.game_over = self._check_end_game()
+        self.capped = False
+        self.outcome = None
+        self.env_seat = snap.env_seat
+        self.obs_version = snap.obs_version
+        self._env_player = self.players[snap.env_seat] if snap.env_pending else None
+        self._public_hash = public_hash(self)
+
+    @classmethod
+    def from_snapshot(cls, snap, logger=None, log_level=LogLevel.OFF, rng=None, agents=None):
+        """
+        Build a new game in the state of snap. Unlogged by default; rng
+        (a seed or RNG object) replaces the snapshot's RNG state if given.
+        """
+        game = cls.__new__(cls)
+        game.num_players = len(snap.players)
+        game.verbose = False
+        game.game_number = snap.game_number
+        game.seed = None
+        game.rng = rng_from_state(snap.rng_state)
+        game._set_logging(log_level, logger)
+        game.agents = agents or {}
+        game.debug_hash = False
+        game.max_turns = None
+        game.stall_rounds = None
+
+        game.players = []
+        for st in snap.players:
+            p = Player(player_id=st[0], role=st[1], character_name=st[2], max_health=st[3])
+            game.players.append(p)
+        game.deck = Deck(rng=game.rng, zkeys=(DECK_KEYS, DISCARD_KEYS))
+        game.distances = DistanceCache(game.players)
+        game.restore(snap)
+        if rng is not None:
+            game.rng = game.deck.rng = make_rng(rng)
+        return game
+
+    @classmethod
+    def rollout_copy(cls, snap):
+        """
+        Unlogged game for random playouts from snap. Returns (game, snap')
+        where snap' is snap with a random.Random state: restore(snap') rewinds
+        the game between playouts whatever RNG the original used; reseed
+        game.rng for each playout.
+        """
+        snap = snap._replace(rng_state=random.Random(0).getstate())
+        return cls.from_snapshot(snap), snap
+
+    def clone(self, logger=None, log_level=LogLevel.OFF):
+        """
+        Unlogged copy of this game (including its RNG state).
+        """
+        return BangGame.from_snapshot(self.snapshot(), logger=logger, log_level=log_level)
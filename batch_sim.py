@@ -0,0 +1,265 @@
+# batch_sim.py
+
+import argparse
+import time
+
+import numpy as np
+
+from character_data import CHARACTERS
+from card import CARD_NAMES, BANG
+from deck import CARD_NAME_CODES
+from enums import Faction
+from parallel_sim import OUTCOME_KEYS, tally_results
+
+# Outcome codes = enums.Faction (they index OUTCOME_KEYS)
+RENEGADE_WINS, OUTLAWS_WIN, SHERIFF_WINS, OTHER, CAPPED = Faction
+
+# Card types = card name codes; the deck as an array of name codes by card id
+DECK_TYPES = np.array(CARD_NAME_CODES, dtype=np.int16)
+NUM_TYPES = len(CARD_NAMES)
+DECK_SIZE = len(DECK_TYPES)
+
+CHAR_NAMES = [name for (name, _, _) in CHARACTERS]
+CHAR_HP = np.array([hp for (_, hp, _) in CHARACTERS], dtype=np.int16)
+PAUL_REGRET = CHAR_NAMES.index("Paul Regret")
+ROSE_DOOLAN = CHAR_NAMES.index("Rose Doolan")
+WILLY_THE_KID = CHAR_NAMES.index("Willy the Kid")
+
+NUM_PLAYERS = 5
+# seats => roles as in BangGame: Sheriff, Renegade, Outlaw, Outlaw, Deputy
+SHERIFF_SEAT, RENEGADE_SEAT, OUTLAW_SEATS = 0, 1, (2, 3)
+
+
+class BatchSimulator:
+    """
+    Plays many BangGames in lockstep with the per-game state held in NumPy
+    arrays (one row per game):
+      - health, alive, mustang/scope, Willy the Kid flag   (B, 5)
+      - hands as card-type count vectors                   (B, 5, T)
+      - deck as a permuted array of card types + length    (B, 80), (B,)
+      - discard pile as a card-type count vector           (B, T)
+
+    Every step plays one turn in every unfinished game, with the same
+    rules BangGame.run_game applies: draw 2, discard everything that is
+    not a Bang!, fire one Bang! (any number for Willy the Kid) at a random
+    player at distance 1, discard down to health, check the end of game.
+    Weapons, Jail and Dynamite never enter play in BangGame either, so
+    they are not modelled. Finished games are compacted out after each turn.
+
+    run() returns (outcome codes, turn counts) per game.
+    """
+
+    def __init__(self, num_games, seed=None, max_turns=10000):
+        self.num_games = num_games
+        self.max_turns = max_turns
+        self.rng = np.random.default_rng(seed)
+
+    def run(self):
+        rng = self.rng
+        B = self.num_games
+        seats = np.arange(NUM_PLAYERS)
+
+        # 5 distinct characters per game
+        chars = np.argsort(rng.random((B, len(CHAR_NAMES))), axis=1)[:, :NUM_PLAYERS]
+        self.health = CHAR_HP[chars].astype(np.int16)
+        self.health[:, SHERIFF_SEAT] += 1
+        self.alive = np.ones((B, NUM_PLAYERS), dtype=bool)
+        self.mustang = (chars == PAUL_REGRET).astype(np.int16)
+        self.scope = (chars == ROSE_DOOLAN).astype(np.int16)
+        self.willy = chars == WILLY_THE_KID
+
+        self.deck = DECK_TYPES[np.argsort(rng.random((B, DECK_SIZE)), axis=1)]
+        self.deck_len = np.full(B, DECK_SIZE, dtype=np.int32)
+        self.discard = np.zeros((B, NUM_TYPES), dtype=np.int32)
+        self.hand = np.zeros((B, NUM_PLAYERS, NUM_TYPES), dtype=np.int16)
+
+        self.current = np.zeros(B, dtype=np.int64)
+        self.turns = np.zeros(B, dtype=np.int32)
+        self.game_ids = np.arange(B)
+
+        # initial hands: each seat draws as many cards as its health
+        for p in range(NUM_PLAYERS):
+            who = np.full(B, p)
+            for k in range(int(self.health[:, p].max())):
+                self._draw(k < self.health[:, p], who)
+
+        outcomes = np.full(B, OTHER, dtype=np.int8)
+        turns = np.zeros(B, dtype=np.int32)
+
+        while len(self.game_ids):
+            self.turns += 1
+            everyone = np.ones(len(self.game_ids), dtype=bool)
+            self._draw(everyone, self.current)
+            self._draw(everyone, self.current)
+            self._play_phase()
+            self._discard_phase()
+
+            result = self._check_end_game()
+            capped = (result < 0) & (self.turns >= self.max_turns)
+            result[capped] = CAPPED
+            ended = result >= 0
+            if ended.any():
+                outcomes[self.game_ids[ended]] = result[ended]
+                turns[self.game_ids[ended]] = self.turns[ended]
+                self._compact(~ended)
+            self._next_player(seats)
+        return outcomes, turns
+
+    def _rows(self):
+        return np.arange(len(self.game_ids))
+
+    def _draw(self, mask, who):
+        """
+        Seat who[b] draws one card in every game where mask[b]; an empty deck
+        is rebuilt from a shuffled discard pile first (as Deck.draw does).
+        """
+        need = mask & (self.deck_len == 0)
+        if need.any():
+            self._reshuffle(np.flatnonzero(need))
+        mask = mask & (self.deck_len > 0)
+        b = np.flatnonzero(mask)
+        if not len(b):
+            return
+        top = self.deck_len[b] - 1
+        t = self.deck[b, top]
+        self.hand[b, who[b], t] += 1
+        self.deck_len[b] = top
+
+    def _reshuffle(self, b):
+        counts = self.discard[b]
+        cum = np.cumsum(counts, axis=1)
+        total = cum[:, -1]
+        pos = np.arange(DECK_SIZE)
+        # expand the count vectors into type lists (T marks unused slots)
+        types = (pos[None, :, None] >= cum[:, None, :]).sum(axis=2)
+        keys = self.rng.random((len(b), DECK_SIZE))
+        keys[pos[None, :] >= total[:, None]] = 2.0
+        order = np.argsort(keys, axis=1)
+        self.deck[b] = np.take_along_axis(types, order, axis=1)
+        self.deck_len[b] = total
+        self.discard[b] = 0
+
+    def _distances_from_current(self):
+        """
+        Effective distance from each game's current player to every seat:
+        seat distance among alive players + target mustang - shooter scope, min 1.
+        """
+        rows = self._rows()
+        alive = self.alive
+        pos = np.cumsum(alive, axis=1) - 1
+        n_alive = alive.sum(axis=1)
+        from_pos = pos[rows, self.current]
+        cw = (pos - from_pos[:, None]) % n_alive[:, None]
+        seat = np.minimum(cw, n_alive[:, None] - cw)
+        dist = seat + self.mustang - self.scope[rows, self.current][:, None]
+        return np.maximum(dist, 1)
+
+    def _play_phase(self):
+        rows = self._rows()
+        cp = self.current
+        hand = self.hand[rows, cp]
+        # every card that is not a Bang! is played straight to the discard pile
+        bangs = hand[:, BANG].copy()
+        hand[:, BANG] = 0
+        self.discard += hand
+        hand[:] = 0
+        hand[:, BANG] = bangs
+        self.hand[rows, cp] = hand
+
+        shooting = bangs > 0
+        seats = np.arange(NUM_PLAYERS)
+        willy = self.willy[rows, cp]
+        while shooting.any():
+            dist = self._distances_from_current()
+            cand = self.alive & (dist <= 1) & (seats[None, :] != cp[:, None])
+            n_cand = cand.sum(axis=1)
+            shooting &= n_cand > 0
+            b = np.flatnonzero(shooting)
+            if not len(b):
+                break
+            pick = (self.rng.random(len(b)) * n_cand[b]).astype(np.int64)
+            target = np.argmax(np.cumsum(cand[b], axis=1) > pick[:, None], axis=1)
+
+            self.hand[b, cp[b], BANG] -= 1
+            self.discard[b, BANG] += 1
+            self.health[b, target] -= 1
+            dead = self.health[b, target] <= 0
+            if dead.any():
+                db, dt = b[dead], target[dead]
+                self.health[db, dt] = 0
+                self.alive[db, dt] = False
+                self.hand[db, dt] = 0
+
+            # only Willy the Kid keeps shooting
+            shooting &= willy & (self.hand[rows, cp, BANG] > 0)
+
+    def _discard_phase(self):
+        rows = self._rows()
+        cp = self.current
+        excess = self.hand[rows, cp].sum(axis=1) - self.health[rows, cp]
+        while (excess > 0).any():
+            b = np.flatnonzero(excess > 0)
+            hand = self.hand[b, cp[b]]
+            pick = (self.rng.random(len(b)) * hand.sum(axis=1)).astype(np.int64)
+            t = np.argmax(np.cumsum(hand, axis=1) > pick[:, None], axis=1)
+            self.hand[b, cp[b], t] -= 1
+            self.discard[b, t] += 1
+            excess[b] -= 1
+
+    def _check_end_game(self):
+        """
+        Outcome code per game, -1 while the game goes on.
+        """
+        alive = self.alive
+        sheriff = alive[:, SHERIFF_SEAT]
+        renegade = alive[:, RENEGADE_SEAT]
+        outlaws = alive[:, OUTLAW_SEATS[0]] | alive[:, OUTLAW_SEATS[1]]
+        renegade_alone = renegade & (alive.sum(axis=1) == 1)
+
+        result = np.full(len(self.game_ids), -1, dtype=np.int8)
+        result[~sheriff] = OUTLAWS_WIN
+        result[~sheriff & renegade_alone] = RENEGADE_WINS
+        result[sheriff & ~outlaws & ~renegade] = SHERIFF_WINS
+        return result
+
+    def _next_player(self, seats):
+        order = (self.current[:, None] + 1 + seats[None, :]) % NUM_PLAYERS
+        nxt_alive = np.take_along_axis(self.alive, order, axis=1)
+        self.current = order[self._rows(), np.argmax(nxt_alive, axis=1)]
+
+    def _compact(self, keep):
+        for name in ("health", "alive", "mustang", "scope", "willy", "deck",
+                     "deck_len", "discard", "hand", "current", "turns", "game_ids"):
+            setattr(self, name, getattr(self, name)[keep])
+
+
+def run_batch(num_games, seed=None, batch_size=50000, max_turns=10000):
+    """
+    Simulate num_games games in batches of batch_size. Returns
+    (outcomes dict keyed like OUTCOME_KEYS, array of turn counts).
+    """
+    ss = np.random.SeedSequence(seed)
+    all_codes = [np.zeros(0, dtype=np.int8)]
+    all_turns = [np.zeros(0, dtype=np.int32)]
+    for start, child in zip(range(0, num_games, batch_size), ss.spawn((num_games + batch_size - 1) // batch_size)):
+        n = min(batch_size, num_games - start)
+        codes, turns = BatchSimulator(n, seed=child, max_turns=max_turns).run()
+        all_codes.append(codes)
+        all_turns.append(turns)
+    return tally_results(np.concatenate(all_codes)), np.concatenate(all_turns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized batch BangGame statistics.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-turns", type=int, default=10000)
+    args = parser.parse_args()
+
+    start = time.time()
+    outcomes, turns = run_batch(args.games, seed=args.seed, batch_size=args.batch_size, max_turns=args.max_turns)
+    elapsed = time.time() - start
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.0f} games/sec), mean {turns.mean():.1f} turns")
+    for k in OUTCOME_KEYS:
+        print(f"{k}: {outcomes[k]} ({outcomes[k] / args.games:.1%})")
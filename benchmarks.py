@@ -0,0 +1,278 @@
+# benchmarks.py
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bang_game import BangGame, NUM_ACTIONS
+from deck import Deck
+from enums import LogLevel
+from game_logger import GameLogger, BufferedGameLogger
+from rng import game_seed
+from zobrist import DECK_KEYS, DISCARD_KEYS
+
+# Every benchmark is a rate (higher is better); compare() flags drops.
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 10.0
+
+EVENT = dict(game_id=1, turn_in_game=7, player_id=2, role="OUTLAW", character="Slab the Killer",
+             action="Damage", target_id=0, hp_before=4, hp_after=3, damage_dealt=1,
+             aggressive_action=1)
+
+
+def bench_games(seed, scale, log_level, tmpdir):
+    """
+    BangGame.run_game at one log level (file logging through BufferedGameLogger).
+    """
+    n = max(1, int(200 * scale))
+    path = os.path.join(tmpdir, f"games_{log_level.name}.csv")
+    if os.path.exists(path):
+        os.remove(path)
+    logger = BufferedGameLogger(path) if log_level != LogLevel.OFF else None
+    start = time.perf_counter()
+    for g in range(n):
+        BangGame(logger=logger, game_number=g + 1, log_level=log_level,
+                 seed=game_seed(seed, g)).run_game()
+    if logger:
+        logger.close()
+    return n, time.perf_counter() - start
+
+
+def bench_logger(seed, scale, logger_cls, tmpdir):
+    """
+    log_event throughput of one logger class, including the final flush.
+    """
+    n = max(1, int(50000 * scale))
+    path = os.path.join(tmpdir, f"events_{logger_cls.__name__}.csv")
+    if os.path.exists(path):
+        os.remove(path)
+    logger = logger_cls(path)
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.log_event(**EVENT)
+    logger.close()
+    return n, time.perf_counter() - start
+
+
+def bench_distance(seed, scale, tmpdir):
+    """
+    DistanceCache.distance / reachable lookups on a seeded deal.
+    """
+    n = max(1, int(200000 * scale))
+    game = BangGame(log_level=LogLevel.OFF, seed=seed)
+    rng = random.Random(seed)
+    queries = [(rng.randrange(5), rng.randrange(5), rng.randrange(1, 6)) for _ in range(1000)]
+    distances = game.distances
+    rounds = max(1, n // len(queries))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i, j, r in queries:
+            distances.distance(i, j)
+            distances.reachable(i, r)
+    return 2 * rounds * len(queries), time.perf_counter() - start
+
+
+def bench_deck(seed, scale, tmpdir):
+    """
+    Deck.draw with every card discarded again, so the draw pile is
+    reshuffled from the discard pile every 80 draws (hash keys on, as in games).
+    """
+    n = max(1, int(200000 * scale))
+    deck = Deck(rng=random.Random(seed), zkeys=(DECK_KEYS, DISCARD_KEYS))
+    deck.shuffle()
+    start = time.perf_counter()
+    for _ in range(n):
+        deck.discard(deck.draw())
+    return n, time.perf_counter() - start
+
+
+def bench_encoding(seed, scale, tmpdir, version=1):
+    """
+    state_encoder.encode_batch rows/sec over games paused at a decision.
+    """
+    from state_encoder import encode_batch, state_size
+    import numpy as np
+
+    games = []
+    for g in range(64):
+        game = BangGame(log_level=LogLevel.OFF)
+        game.reset(seed=game_seed(seed, g), observe=False)
+        games.append(game)
+    out = np.empty((len(games), state_size(version)), dtype=np.float32)
+    rounds = max(1, int(2000 * scale))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encode_batch(games, out, version)
+    return rounds * len(games), time.perf_counter() - start
+
+
+def bench_replay(seed, scale, tmpdir, batch_size=32):
+    """
+    DQNAgent.replay updates/sec on a memory filled with random transitions.
+    """
+    import numpy as np
+    import torch
+    from run_training import DQNAgent
+    from state_encoder import state_size
+
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    size = state_size(1)
+    agent = DQNAgent(size, NUM_ACTIONS, memory_size=10000)
+    agent.memory.rng = rng
+    n = agent.memory.capacity
+    agent.remember_batch(rng.random((n, size), dtype=np.float32), rng.integers(NUM_ACTIONS, size=n),
+                         rng.choice([-1.0, 0.0, 1.0], size=n), rng.random((n, size), dtype=np.float32),
+                         rng.random(n) < 0.05)
+    updates = max(1, int(300 * scale))
+    start = time.perf_counter()
+    for _ in range(updates):
+        agent.replay(batch_size)
+    return updates, time.perf_counter() - start
+
+
+# name => (function, extra kwargs, unit)
+BENCHMARKS = {
+    **{f"games_{level.name.lower()}": (bench_games, {"log_level": level}, "games/sec")
+       for level in LogLevel},
+    "logger_events": (bench_logger, {"logger_cls": GameLogger}, "events/sec"),
+    "buffered_logger_events": (bench_logger, {"logger_cls": BufferedGameLogger}, "events/sec"),
+    "distance_queries": (bench_distance, {}, "queries/sec"),
+    "deck_draws": (bench_deck, {}, "draws/sec"),
+    "state_encoding": (bench_encoding, {}, "rows/sec"),
+    "replay_updates": (bench_replay, {}, "updates/sec"),
+}
+
+
+def machine_info():
+    info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["git_commit"] = None
+    for mod in ("numpy", "torch"):
+        if mod in sys.modules:
+            info[mod] = sys.modules[mod].__version__
+    if "torch" in sys.modules:
+        info["torch_threads"] = sys.modules["torch"].get_num_threads()
+    return info
+
+
+def run_benchmarks(names=None, seed=0, repeat=3, scale=1.0, verbose=True):
+    """
+    Run the named benchmarks (default: all) repeat times each with the same
+    seed and keep the best rate, the usual way to damp machine noise.
+    A benchmark whose dependency is missing is recorded as skipped.
+    Returns the JSON-ready report: {"meta": ..., "results": {name: ...}}.
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in names:
+            fn, kwargs, unit = BENCHMARKS[name]
+            rates = []
+            try:
+                for _ in range(repeat):
+                    ops, elapsed = fn(seed, scale, tmpdir=tmpdir, **kwargs)
+                    rates.append(ops / elapsed)
+            except ImportError as e:
+                results[name] = {"unit": unit, "skipped": str(e)}
+                if verbose:
+                    print(f"{name:24s} skipped ({e})")
+                continue
+            results[name] = {"value": max(rates), "unit": unit, "runs": rates}
+            if verbose:
+                print(f"{name:24s} {max(rates):14,.1f} {unit}")
+
+    meta = machine_info()
+    meta.update(format_version=FORMAT_VERSION, timestamp=datetime.now().isoformat(timespec="seconds"),
+                seed=seed, repeat=repeat, scale=scale)
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two reports benchmark by benchmark. Returns a list of
+    (name, baseline value, current value, change %, regressed) for the
+    benchmarks both have; regressed means slower by more than threshold %.
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None or "value" not in base or "value" not in cur:
+            continue
+        change = (cur["value"] - base["value"]) / base["value"] * 100.0
+        rows.append((name, base["value"], cur["value"], change, change < -threshold))
+    return rows
+
+
+def print_comparison(rows, threshold):
+    for name, base, cur, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:24s} {base:14,.1f} -> {cur:14,.1f} {change:+7.1f}% {flag}")
+    regressions = sum(r[4] for r in rows)
+    print(f"{regressions} regression(s) beyond {threshold:.1f}%")
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmarks and save the results as JSON")
+    run.add_argument("--out", default="benchmarks.json")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--scale", type=float, default=1.0, help="multiplies the work per benchmark")
+    run.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="subset of benchmarks")
+    run.add_argument("--baseline", help="compare against this saved report afterwards")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="regression threshold in %%")
+
+    cmp = sub.add_parser("compare", help="compare a report against a saved baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="regression threshold in %%")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        report = run_benchmarks(args.only, seed=args.seed, repeat=args.repeat, scale=args.scale)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {args.out}")
+        if not args.baseline:
+            return 0
+        baseline, current = _load(args.baseline), report
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+    # non-zero exit status => usable as a CI gate
+    return 1 if print_comparison(compare(baseline, current, args.threshold), args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,75 @@
 from enums import Suit, Value
 
+# Every distinct card effect, in order of first appearance in the official deck.
+# Card.name_code indexes this tuple.
+CARD_NAMES = (
+    "Bang!",
+    "Missed!",
+    "Beer",
+    "Saloon",
+    "Stagecoach",
+    "Wells Fargo",
+    "Cat Balou",
+    "Panic!",
+    "General Store",
+    "Indians!",
+    "Duel",
+    "Gatling",
+    "Jail",
+    "Dynamite",
+    "Volcanic",
+    "Schofield",
+    "Remington",
+    "Rev. Carbine",
+    "Winchester",
+    "Mustang",
+    "Scope",
+    "Barrel",
+)
+NAME_CODES = {name: i for i, name in enumerate(CARD_NAMES)}
+BANG = NAME_CODES["Bang!"]
+MISSED = NAME_CODES["Missed!"]
+
+
 class Card:
     """
     Represents a playing card in Bang!: has suit, value, and a 'name' for the effect.
     E.g., suit=Hearts, value=3, name="Bang!"
+
+    Cards are immutable flyweights: the official deck is built once
+    (deck.CARD_TABLE) and games only pass around card ids (0..79).
     """
-    def __init__(self, suit: Suit, value: Value, name: str):
-        self.suit = suit
-        self.value = value
-        self.name = name
+    __slots__ = ("card_id", "suit", "value", "name", "name_code", "display")
+
+    def __init__(self, suit: Suit, value: Value, name: str, card_id: int = None):
+        setattr_ = object.__setattr__
+        setattr_(self, "card_id", card_id)
+        setattr_(self, "suit", suit)
+        setattr_(self, "value", value)
+        setattr_(self, "name", name)
+        setattr_(self, "name_code", NAME_CODES[name])
+        setattr_(self, "display", f"{name}({suit.name}, {value.name})")
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Card is immutable")
+
+    # immutable => copies can share the object
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # table cards unpickle as the shared CARD_TABLE entry
+        if self.card_id is not None:
+            return (_table_card, (self.card_id,))
+        return (Card, (self.suit, self.value, self.name))
 
     def __repr__(self):
-        return f"{self.name}({self.suit.name}, {self.value.name})"
+        return self.display
+
+
+def _table_card(card_id):
+    from deck import CARD_TABLE
+    return CARD_TABLE[card_id]
@@ -0,0 +1,307 @@
+# columnar_log.py
+
+import argparse
+import array
+import atexit
+import csv
+import json
+import os
+import sys
+
+from enums import Role
+from character_data import CHARACTERS
+from card import CARD_NAMES
+from deck import CARD_DISPLAY
+from game_logger import CSV_HEADER
+
+FORMAT_VERSION = 1
+
+# Missing cells: numeric columns use the int32 minimum (HP can go negative),
+# dictionary-encoded columns use -1.
+MISSING = -(2 ** 31)
+MISSING_CODE = -1
+
+ACTION_NAMES = [
+    "Draw",
+    "PlayCard",
+    "Bang",
+    "Damage",
+    "Eliminate",
+    "Discard",
+    "TurnEnd",
+    "DynamiteExplode",
+    "DynamitePass",
+    "JailEscape",
+    "JailSkip",
+    "GameOver",
+]
+
+GAME_RESULT_NAMES = ["Win", "Loss", "NoOutcome", "Capped"]
+
+
+def _card_names():
+    """
+    str(card) for every card of the official deck (codes 0..79 = card ids),
+    followed by the bare effect names ("Dynamite", "Jail", ...).
+    """
+    return list(CARD_DISPLAY) + list(CARD_NAMES)
+
+
+def default_dictionaries():
+    """
+    Starting dictionaries for the encoded columns. Values not in the
+    tables (e.g. from an old CSV) are appended and saved in meta.json.
+    """
+    return {
+        "Role": [r.name for r in Role] + ["Env"],
+        "Character": [name for (name, _, _) in CHARACTERS] + ["None"],
+        "Action": list(ACTION_NAMES),
+        "CardName": _card_names(),
+        "GameResult": list(GAME_RESULT_NAMES),
+    }
+
+
+# (column, array typecode, dictionary-encoded?)  -- same order as CSV_HEADER
+COLUMNS = [
+    ("GameID", "i", False),
+    ("Turn", "i", False),
+    ("PlayerID", "b", False),
+    ("Role", "b", True),
+    ("Character", "b", True),
+    ("Action", "b", True),
+    ("CardName", "h", True),
+    ("TargetID", "i", False),
+    ("HP_Before", "i", False),
+    ("HP_After", "i", False),
+    ("DamageDealt", "i", False),
+    ("CardsInHand_Start", "i", False),
+    ("CardsInHand_End", "i", False),
+    ("AggressiveAction", "b", False),
+    ("GameResult", "b", True),
+    ("SurvivedTurns", "i", False),
+]
+assert [name for (name, _, _) in COLUMNS] == CSV_HEADER
+
+_NUMPY_DTYPES = {"b": "i1", "h": "i2", "i": "i4"}
+
+
+class ColumnarGameLogger:
+    """
+    Drop-in alternative to GameLogger that writes a columnar binary log:
+    a directory with one raw fixed-width native-endian integer file
+    per column (<Column>.bin) and a meta.json holding the dtypes and the
+    string dictionaries for Role, Character, Action, CardName and GameResult.
+
+    Rows are collected per column and appended to the column files in
+    chunks of chunk_rows (and on flush()/close(), which BangGame calls at
+    game end), so each file is a plain array that load_columnar_log can
+    memory-map with NumPy. An existing directory is appended to.
+    """
+
+    def __init__(self, dirname="bang_log.cols", chunk_rows=65536):
+        self.dirname = dirname
+        self.chunk_rows = chunk_rows
+        self.closed = False
+        os.makedirs(self.dirname, exist_ok=True)
+
+        meta_path = os.path.join(self.dirname, "meta.json")
+        if os.path.isfile(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("byteorder") != sys.byteorder:
+                raise ValueError(f"{self.dirname} was written with {meta.get('byteorder')} byte order")
+            self.dictionaries = meta["dictionaries"]
+        else:
+            self.dictionaries = default_dictionaries()
+        self._codes = {
+            col: {value: i for i, value in enumerate(values)}
+            for col, values in self.dictionaries.items()
+        }
+        self._write_meta()
+
+        self._files = [
+            open(os.path.join(self.dirname, name + ".bin"), "ab")
+            for (name, _, _) in COLUMNS
+        ]
+        self._columns = [array.array(code) for (_, code, _) in COLUMNS]
+        self._rows = 0
+        atexit.register(self.close)
+
+    def _write_meta(self):
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "missing": MISSING,
+            "missing_code": MISSING_CODE,
+            "columns": [[name, _NUMPY_DTYPES[code]] for (name, code, _) in COLUMNS],
+            "dictionaries": self.dictionaries,
+        }
+        tmp = os.path.join(self.dirname, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, os.path.join(self.dirname, "meta.json"))
+
+    def _encode(self, column, value):
+        if value is None or value == "":
+            return MISSING_CODE
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+            codes[value] = code
+            self._write_meta()
+        return code
+
+    def log_event(
+        self,
+        game_id: int,
+        turn_in_game: int,
+        player_id: int,
+        role: str,
+        character: str,
+        action: str,
+        card_name: str = "",
+        target_id: int = None,
+        hp_before: int = None,
+        hp_after: int = None,
+        damage_dealt: int = 0,
+        cards_in_hand_start: int = None,
+        cards_in_hand_end: int = None,
+        aggressive_action: int = 0,
+        game_result: str = "",
+        survived_turns: int = 0
+    ):
+        """
+        Encodes one event into the column buffers; appends a chunk when full.
+        """
+        if self.closed:
+            raise ValueError("log_event on a closed ColumnarGameLogger")
+        cols = self._columns
+        cols[0].append(game_id)
+        cols[1].append(turn_in_game)
+        cols[2].append(player_id)
+        cols[3].append(self._encode("Role", role))
+        cols[4].append(self._encode("Character", character))
+        cols[5].append(self._encode("Action", action))
+        cols[6].append(self._encode("CardName", card_name))
+        cols[7].append(MISSING if target_id is None else target_id)
+        cols[8].append(MISSING if hp_before is None else hp_before)
+        cols[9].append(MISSING if hp_after is None else hp_after)
+        cols[10].append(damage_dealt)
+        cols[11].append(MISSING if cards_in_hand_start is None else cards_in_hand_start)
+        cols[12].append(MISSING if cards_in_hand_end is None else cards_in_hand_end)
+        cols[13].append(aggressive_action)
+        cols[14].append(self._encode("GameResult", game_result))
+        cols[15].append(survived_turns)
+        self._rows += 1
+        if self._rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.closed or not self._rows:
+            return
+        for f, col in zip(self._files, self._columns):
+            col.tofile(f)
+            f.flush()
+            del col[:]
+        self._rows = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        for f in self._files:
+            f.close()
+        self.closed = True
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def load_columnar_log(dirname):
+    """
+    Memory-map a columnar log. Returns (columns, meta) where columns maps
+    each column name to a read-only numpy.memmap of equal length.
+    """
+    import numpy as np
+
+    with open(os.path.join(dirname, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    order = "<" if meta["byteorder"] == "little" else ">"
+
+    # a crash mid-chunk can leave some columns longer => trim to the shortest
+    rows = None
+    for name, dtype in meta["columns"]:
+        n = os.path.getsize(os.path.join(dirname, name + ".bin")) // np.dtype(dtype).itemsize
+        rows = n if rows is None else min(rows, n)
+
+    columns = {}
+    for name, dtype in meta["columns"]:
+        path = os.path.join(dirname, name + ".bin")
+        if rows:
+            columns[name] = np.memmap(path, dtype=order + dtype, mode="r", shape=(rows,))
+        else:
+            columns[name] = np.zeros(0, dtype=order + dtype)
+    return columns, meta
+
+
+def decode_column(meta, column, codes):
+    """
+    Map dictionary codes back to strings ("" for missing).
+    """
+    values = meta["dictionaries"][column]
+    return [values[c] if c >= 0 else "" for c in codes]
+
+
+def convert_csv(csv_path, dirname, chunk_rows=65536):
+    """
+    Migrate a bang_log.csv (16-column GameLogger schema) into a columnar log.
+    Returns the number of rows converted.
+    """
+    def opt_int(s):
+        return int(s) if s != "" else None
+
+    n = 0
+    with open(csv_path, newline="", encoding="utf-8") as f, \
+            ColumnarGameLogger(dirname, chunk_rows=chunk_rows) as out:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header != CSV_HEADER:
+            raise ValueError(f"{csv_path} does not have the GameLogger header")
+        for row in reader:
+            out.log_event(
+                game_id=int(row[0]),
+                turn_in_game=int(row[1]),
+                player_id=int(row[2]),
+                role=row[3],
+                character=row[4],
+                action=row[5],
+                card_name=row[6],
+                target_id=opt_int(row[7]),
+                hp_before=opt_int(row[8]),
+                hp_after=opt_int(row[9]),
+                damage_dealt=int(row[10] or 0),
+                cards_in_hand_start=opt_int(row[11]),
+                cards_in_hand_end=opt_int(row[12]),
+                aggressive_action=int(row[13] or 0),
+                game_result=row[14],
+                survived_turns=int(row[15] or 0)
+            )
+            n += 1
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a bang_log.csv into a columnar binary log.")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_dir")
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    args = parser.parse_args()
+    rows = convert_csv(args.csv_path, args.out_dir, chunk_rows=args.chunk_rows)
+    print(f"Converted {rows} rows into {args.out_dir}")
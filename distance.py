@@ -30,3 +30,77 @@ def effective_distance(game, from_player, to_player):
     if dist < 1:
         dist = 1
     return dist
+
+# (eliminated, mustang, scope) per seat => (matrix, reachable); there are
+# only a handful of distinct layouts, so games share the computed tables.
+_LAYOUTS = {}
+
+class DistanceCache:
+    """
+    Effective-distance matrix for one game, owned by BangGame:
+      matrix[i][j] = effective_distance between alive seats i and j (None if eliminated)
+    plus, per attacker, the targets within each weapon range, so Bang!
+    target selection is a lookup. Call refresh() whenever a player is
+    eliminated or mustang/scope changes; queries never rebuild anything.
+    """
+
+    def __init__(self, players):
+        self.players = players
+        self._layout = None
+        self.refresh()
+
+    def refresh(self):
+        layout = tuple((p.eliminated, p.mustang, p.scope) for p in self.players)
+        if layout == self._layout:
+            return
+        tables = _LAYOUTS.get(layout)
+        if tables is None:
+            tables = _LAYOUTS[layout] = _build_tables(layout)
+        self._layout = layout
+        self.matrix, self._reachable = tables
+
+    def distance(self, from_idx, to_idx):
+        return self.matrix[from_idx][to_idx]
+
+    def reachable(self, from_idx, weapon_range):
+        """
+        Seat indices of the alive players within weapon_range of from_idx.
+        """
+        by_range = self._reachable[from_idx]
+        if weapon_range >= len(by_range):
+            weapon_range = len(by_range) - 1
+        return by_range[weapon_range]
+
+
+def _build_tables(layout):
+    n = len(layout)
+    alive_indices = [i for i, (eliminated, _, _) in enumerate(layout) if not eliminated]
+    pos = {idx: k for k, idx in enumerate(alive_indices)}
+    m = len(alive_indices)
+
+    matrix = [[None] * n for _ in range(n)]
+    max_dist = 0
+    for i in alive_indices:
+        row = matrix[i]
+        scope = layout[i][2]
+        for j in alive_indices:
+            if i == j:
+                row[j] = 0
+                continue
+            clockwise = (pos[j] - pos[i]) % m
+            dist = min(clockwise, m - clockwise) + layout[j][1] - scope
+            if dist < 1:
+                dist = 1
+            row[j] = dist
+            if dist > max_dist:
+                max_dist = dist
+
+    # reachable[i][r] = seats (in seat order) attacker i reaches with range r
+    reachable = [((),) * (max_dist + 1) for _ in range(n)]
+    for i in alive_indices:
+        row = matrix[i]
+        reachable[i] = tuple(
+            tuple(j for j in alive_indices if j != i and row[j] <= r)
+            for r in range(max_dist + 1)
+        )
+    return tuple(tuple(row) for row in matrix), tuple(reachable)
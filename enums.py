@@ -1,4 +1,4 @@
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
 class Suit(Enum):
     CLUBS = auto()
@@ -42,3 +42,27 @@ class Role(Enum):
     DEPUTY = auto()
     OUTLAW = auto()
     RENEGADE = auto()
+
+class Faction(IntEnum):
+    """
+    Outcome of a game: the winning side, NONE while undecided, or CAPPED
+    when a turn / stall limit cut it off. Values index parallel_sim.OUTCOME_KEYS.
+    """
+    RENEGADE = 0
+    OUTLAWS = 1
+    SHERIFF_DEPUTIES = 2
+    NONE = 3
+    CAPPED = 4
+
+class LogLevel(IntEnum):
+    """
+    How much BangGame writes to its logger:
+      OFF      => nothing (no logger is created)
+      OUTCOMES => only the GameOver rows
+      TURNS    => GameOver + TurnEnd + Eliminate rows
+      FULL     => every event
+    """
+    OFF = 0
+    OUTCOMES = 1
+    TURNS = 2
+    FULL = 3
@@ -1,10 +1,15 @@
 import random
+from hand import Hand
 
 class BangGame:
     def __init__(self, players, max_turns=1000, verbose=True):
         if not isinstance(players, list):
             raise TypeError("Expected a list of players for BangGame initialization.")
         self.players = players
+        # legacy hands hold card-name strings => unkeyed Hand (O(1) "Bang!" in hand)
+        for p in self.players:
+            if not (isinstance(p.hand, Hand) and p.hand.key is None):
+                p.hand = Hand(p.hand)
         self.deck = self.create_deck()
         self.discard_pile = []
         self.turn = 0
@@ -232,7 +237,7 @@ class BangGame:
         """Steal a card from the target player."""
         target = self.players[target_id]
         if not target.eliminated and target.hand:
-            stolen_card = random.choice(target.hand)
+            stolen_card = target.hand.choice(random)
             target.hand.remove(stolen_card)
             player.hand.append(stolen_card)
             if self.verbose:
@@ -242,7 +247,7 @@ class BangGame:
         """Discard a card from the target player."""
         target = self.players[target_id]
         if not target.eliminated and target.hand:
-            discarded_card = random.choice(target.hand)
+            discarded_card = target.hand.choice(random)
             target.hand.remove(discarded_card)
             self.discard_pile.append(discarded_card)
             if self.verbose:
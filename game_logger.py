@@ -1,5 +1,70 @@
+import atexit
 import csv
+import io
 import os
+import queue
+import threading
+
+CSV_HEADER = [
+    "GameID",
+    "Turn",
+    "PlayerID",
+    "Role",
+    "Character",
+    "Action",
+    "CardName",
+    "TargetID",
+    "HP_Before",
+    "HP_After",
+    "DamageDealt",
+    "CardsInHand_Start",
+    "CardsInHand_End",
+    "AggressiveAction",
+    "GameResult",
+    "SurvivedTurns"
+]
+
+
+def format_row(
+    game_id,
+    turn_in_game,
+    player_id,
+    role,
+    character,
+    action,
+    card_name="",
+    target_id=None,
+    hp_before=None,
+    hp_after=None,
+    damage_dealt=0,
+    cards_in_hand_start=None,
+    cards_in_hand_end=None,
+    aggressive_action=0,
+    game_result="",
+    survived_turns=0
+):
+    """
+    Turn one event into the 16-column CSV row (None => empty cell).
+    """
+    return [
+        game_id,
+        turn_in_game,
+        player_id,
+        role,
+        character,
+        action,
+        card_name,
+        str(target_id) if target_id is not None else "",
+        str(hp_before) if hp_before is not None else "",
+        str(hp_after) if hp_after is not None else "",
+        str(damage_dealt),
+        str(cards_in_hand_start) if cards_in_hand_start is not None else "",
+        str(cards_in_hand_end) if cards_in_hand_end is not None else "",
+        str(aggressive_action),
+        game_result,
+        str(survived_turns)
+    ]
+
 
 class GameLogger:
     """
@@ -37,24 +102,7 @@ class GameLogger:
             # create new file and write header
             with open(self.filename, mode="w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "GameID",
-                    "Turn",
-                    "PlayerID",
-                    "Role",
-                    "Character",
-                    "Action",
-                    "CardName",
-                    "TargetID",
-                    "HP_Before",
-                    "HP_After",
-                    "DamageDealt",
-                    "CardsInHand_Start",
-                    "CardsInHand_End",
-                    "AggressiveAction",
-                    "GameResult",
-                    "SurvivedTurns"
-                ])
+                writer.writerow(CSV_HEADER)
         # If file exists, do nothing: we will just append rows later.
 
     def log_event(
@@ -81,22 +129,217 @@ class GameLogger:
         """
         with open(self.filename, mode="a", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            row = [
-                game_id,
-                turn_in_game,
-                player_id,
-                role,
-                character,
-                action,
-                card_name,
-                str(target_id) if target_id is not None else "",
-                str(hp_before) if hp_before is not None else "",
-                str(hp_after) if hp_after is not None else "",
-                str(damage_dealt),
-                str(cards_in_hand_start) if cards_in_hand_start is not None else "",
-                str(cards_in_hand_end) if cards_in_hand_end is not None else "",
-                str(aggressive_action),
-                game_result,
-                str(survived_turns)
-            ]
-            writer.writerow(row)
+            writer.writerow(format_row(
+                game_id, turn_in_game, player_id, role, character, action,
+                card_name, target_id, hp_before, hp_after, damage_dealt,
+                cards_in_hand_start, cards_in_hand_end, aggressive_action,
+                game_result, survived_turns
+            ))
+
+    def flush(self):
+        """
+        Every row is already on disk; kept so BangGame can flush any logger.
+        """
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class BufferedGameLogger(GameLogger):
+    """
+    Same CSV output as GameLogger, but keeps one file handle open and
+    collects formatted rows in memory. The buffer is written out when it
+    reaches max_rows rows or max_bytes characters, on flush()/close(),
+    at the end of every game (BangGame calls flush()) and at interpreter exit.
+
+    Usage:
+        with BufferedGameLogger("bang_log.csv", max_rows=10000) as logger:
+            BangGame(logger=logger).run_game()
+    """
+
+    def __init__(self, filename="bang_log.csv", max_rows=5000, max_bytes=1 << 20):
+        super().__init__(filename)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+
+        self._file = open(self.filename, mode="a", newline="", encoding="utf-8")
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._rows = 0
+        self.closed = False
+        atexit.register(self.close)
+
+    def log_event(
+        self,
+        game_id: int,
+        turn_in_game: int,
+        player_id: int,
+        role: str,
+        character: str,
+        action: str,
+        card_name: str = "",
+        target_id: int = None,
+        hp_before: int = None,
+        hp_after: int = None,
+        damage_dealt: int = 0,
+        cards_in_hand_start: int = None,
+        cards_in_hand_end: int = None,
+        aggressive_action: int = 0,
+        game_result: str = "",
+        survived_turns: int = 0
+    ):
+        """
+        Formats the row into the in-memory buffer; writes out when a limit is hit.
+        """
+        if self.closed:
+            raise ValueError("log_event on a closed BufferedGameLogger")
+        self._writer.writerow(format_row(
+            game_id, turn_in_game, player_id, role, character, action,
+            card_name, target_id, hp_before, hp_after, damage_dealt,
+            cards_in_hand_start, cards_in_hand_end, aggressive_action,
+            game_result, survived_turns
+        ))
+        self._rows += 1
+        if self._rows >= self.max_rows or self._buffer.tell() >= self.max_bytes:
+            self.flush()
+
+    def flush(self):
+        if self.closed or not self._rows:
+            return
+        self._file.write(self._buffer.getvalue())
+        self._file.flush()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._rows = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._file.close()
+        self.closed = True
+        atexit.unregister(self.close)
+
+
+_STOP = object()
+
+
+class AsyncGameLogger(GameLogger):
+    """
+    Same CSV output as GameLogger, but log_event only puts the raw event on
+    a bounded queue; a dedicated writer thread formats the rows and writes
+    them, flushing the file whenever the queue drains.
+
+    policy decides what happens when the queue is full:
+      - "block":       wait for the writer thread (no events lost)
+      - "drop_oldest": throw away the oldest queued event to make room
+      - "drop":        throw away the new event
+    Dropped events are counted in .dropped; .queue_depth is the current backlog.
+    """
+
+    POLICIES = ("block", "drop_oldest", "drop")
+
+    def __init__(self, filename="bang_log.csv", max_queue=10000, policy="block"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}', expected one of {self.POLICIES}")
+        super().__init__(filename)
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = open(self.filename, mode="a", newline="", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="AsyncGameLogger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def log_event(
+        self,
+        game_id: int,
+        turn_in_game: int,
+        player_id: int,
+        role: str,
+        character: str,
+        action: str,
+        card_name: str = "",
+        target_id: int = None,
+        hp_before: int = None,
+        hp_after: int = None,
+        damage_dealt: int = 0,
+        cards_in_hand_start: int = None,
+        cards_in_hand_end: int = None,
+        aggressive_action: int = 0,
+        game_result: str = "",
+        survived_turns: int = 0
+    ):
+        """
+        Queues the event; formatting and disk I/O happen on the writer thread.
+        """
+        if self.closed:
+            raise ValueError("log_event on a closed AsyncGameLogger")
+        event = (
+            game_id, turn_in_game, player_id, role, character, action,
+            card_name, target_id, hp_before, hp_after, damage_dealt,
+            cards_in_hand_start, cards_in_hand_end, aggressive_action,
+            game_result, survived_turns
+        )
+        if self.policy == "block":
+            self._queue.put(event)
+            return
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                self.dropped += 1
+                if self.policy == "drop":
+                    return
+            # drop_oldest => make room and retry
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+
+    def _run(self):
+        writer = csv.writer(self._file)
+        q = self._queue
+        while True:
+            event = q.get()
+            if event is _STOP:
+                self._file.flush()
+                q.task_done()
+                return
+            writer.writerow(format_row(*event))
+            if q.empty():
+                self._file.flush()
+            q.task_done()
+
+    def flush(self, wait=False):
+        """
+        The writer thread flushes the file on its own whenever the queue
+        drains, so by default this does not block the simulation.
+        wait=True blocks until everything queued so far is on disk.
+        """
+        if wait and not self.closed:
+            self._queue.join()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+        atexit.unregister(self.close)
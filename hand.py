@@ -0,0 +1,170 @@
+# hand.py
+
+
+class Hand:
+    """
+    A player's hand: the cards themselves plus, for every card type, the
+    slots holding cards of that type. Gives O(1)
+      - "has a Bang!/Missed!" queries (has_type / count_type / `in`)
+      - removal of a given card or of any card of a type
+      - uniform random choice without copying
+    Removal swaps the last card into the freed slot, so the order of
+    the cards is not preserved.
+
+    key maps a card to its type, e.g. deck.CARD_NAME_CODES.__getitem__ for
+    the card ids of bang_game; cards must then be unique. Without a key every
+    card is its own type and duplicates are fine (the legacy game.py hands
+    of card-name strings).
+
+    zkeys (card -> 64-bit int, e.g. zobrist.HAND_KEYS[seat]) makes the hand
+    keep zhash, the XOR of its cards' keys, up to date.
+    """
+
+    __slots__ = ("key", "zkeys", "zhash", "_cards", "_types", "_bpos", "_buckets", "_slot")
+
+    def __init__(self, cards=(), key=None, zkeys=None):
+        self.key = key
+        self.zkeys = zkeys
+        self.zhash = 0
+        self._cards = []      # slot -> card
+        self._types = []      # slot -> card type
+        self._bpos = []       # slot -> position inside its type bucket
+        self._buckets = {}    # type -> slots holding that type
+        self._slot = {} if key is not None else None   # card -> slot (keyed hands)
+        for c in cards:
+            self.append(c)
+
+    def append(self, card):
+        t = card if self.key is None else self.key(card)
+        bucket = self._buckets.get(t)
+        if bucket is None:
+            bucket = self._buckets[t] = []
+        slot = len(self._cards)
+        self._cards.append(card)
+        self._types.append(t)
+        self._bpos.append(len(bucket))
+        bucket.append(slot)
+        if self._slot is not None:
+            self._slot[card] = slot
+        if self.zkeys is not None:
+            self.zhash ^= self.zkeys[card]
+
+    def _remove_slot(self, slot):
+        cards, types, bpos = self._cards, self._types, self._bpos
+        card = cards[slot]
+
+        # drop the slot from its type bucket
+        bucket = self._buckets[types[slot]]
+        moved = bucket.pop()
+        if moved != slot:
+            bucket[bpos[slot]] = moved
+            bpos[moved] = bpos[slot]
+
+        # fill the hole with the last slot
+        last = len(cards) - 1
+        if slot != last:
+            mc, mt, mb = cards[last], types[last], bpos[last]
+            cards[slot], types[slot], bpos[slot] = mc, mt, mb
+            self._buckets[mt][mb] = slot
+            if self._slot is not None:
+                self._slot[mc] = slot
+        cards.pop()
+        types.pop()
+        bpos.pop()
+        if self._slot is not None:
+            del self._slot[card]
+        if self.zkeys is not None:
+            self.zhash ^= self.zkeys[card]
+        return card
+
+    def remove(self, card):
+        if self._slot is not None:
+            slot = self._slot.get(card)
+            if slot is None:
+                raise ValueError(f"{card!r} not in hand")
+        else:
+            bucket = self._buckets.get(card)
+            if not bucket:
+                raise ValueError(f"{card!r} not in hand")
+            slot = bucket[-1]
+        self._remove_slot(slot)
+
+    def remove_type(self, card_type):
+        """
+        Remove and return any card of the given type (ValueError if none).
+        """
+        bucket = self._buckets.get(card_type)
+        if not bucket:
+            raise ValueError(f"no card of type {card_type!r} in hand")
+        return self._remove_slot(bucket[-1])
+
+    def count_type(self, card_type):
+        bucket = self._buckets.get(card_type)
+        return len(bucket) if bucket else 0
+
+    def has_type(self, card_type):
+        return bool(self._buckets.get(card_type))
+
+    def types(self):
+        """
+        Sorted card types currently in the hand.
+        """
+        return sorted(t for t, bucket in self._buckets.items() if bucket)
+
+    def choice(self, rng):
+        """
+        Uniformly random card (not removed); rng is a random.Random-like object.
+        """
+        return self._cards[rng.randrange(len(self._cards))]
+
+    def sample(self, k, rng):
+        """
+        k distinct cards chosen uniformly at random (not removed).
+        """
+        return rng.sample(self._cards, k)
+
+    def clear(self):
+        self._cards.clear()
+        self._types.clear()
+        self._bpos.clear()
+        self._buckets.clear()
+        if self._slot is not None:
+            self._slot.clear()
+        self.zhash = 0
+
+    def getstate(self):
+        """
+        (cards, bucket positions): enough for setstate() to rebuild the hand
+        with the same slots and the same card picked by remove_type().
+        """
+        return tuple(self._cards), tuple(self._bpos)
+
+    def setstate(self, state):
+        cards, bpos = state
+        self.clear()
+        for c in cards:
+            self.append(c)
+        buckets, types = self._buckets, self._types
+        for slot, pos in enumerate(bpos):
+            buckets[types[slot]][pos] = slot
+        self._bpos[:] = bpos
+
+    def to_list(self):
+        return list(self._cards)
+
+    def __contains__(self, card):
+        if self._slot is not None:
+            return card in self._slot
+        return bool(self._buckets.get(card))
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __getitem__(self, i):
+        return self._cards[i]
+
+    def __repr__(self):
+        return f"Hand({self._cards!r})"
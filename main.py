@@ -1,8 +1,16 @@
 # main.py
 
-from run_training import train_bang_agents
+import time
+
+_START = time.perf_counter()
+
+from run_training import train_bang_agents, load_ml_deps
 
 def main():
+    # torch & co. are imported lazily => time them here so startup is visible
+    load_ml_deps()
+    print(f"Startup: {time.perf_counter() - _START:.2f}s (imports incl. torch)")
+
     # Call the training function, which returns a dictionary of outcomes.
     results = train_bang_agents(num_episodes=1000)
 
@@ -12,6 +20,7 @@ def main():
     print("Outlaws win:", results["Outlaws"])
     print("Sheriff/Deputies win:", results["Sheriff/Deputies"])
     print("Other outcomes:", results["Other"])
+    print("Capped (turn cap):", results["Capped"])
 
 if __name__ == "__main__":
     main()
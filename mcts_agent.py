@@ -0,0 +1,251 @@
+# mcts_agent.py
+
+import argparse
+import math
+import random
+import time
+from collections import OrderedDict
+
+from bang_game import BangGame, ACTION_PASS
+from enums import Role, LogLevel, Faction
+from rng import game_seed
+
+# which GameResult.winner a seat is playing for
+ROLE_FACTION = {
+    Role.SHERIFF: Faction.SHERIFF_DEPUTIES,
+    Role.DEPUTY: Faction.SHERIFF_DEPUTIES,
+    Role.OUTLAW: Faction.OUTLAWS,
+    Role.RENEGADE: Faction.RENEGADE,
+}
+
+
+class Node:
+    """
+    Search statistics of one decision point: visits plus per-action
+    visit counts and summed rewards.
+    """
+    __slots__ = ("visits", "n", "w")
+
+    def __init__(self):
+        self.visits = 0
+        self.n = {}
+        self.w = {}
+
+
+class TranspositionTable:
+    """
+    Bounded map state key -> Node with least-recently-used eviction.
+    """
+
+    def __init__(self, max_size=100000):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._nodes = OrderedDict()
+        self.hits = 0
+        self.evictions = 0
+
+    def get(self, key):
+        node = self._nodes.get(key)
+        if node is not None:
+            self._nodes.move_to_end(key)
+            self.hits += 1
+        return node
+
+    def add(self, key, node):
+        self._nodes[key] = node
+        if len(self._nodes) > self.max_size:
+            self._nodes.popitem(last=False)
+            self.evictions += 1
+        return node
+
+    def clear(self):
+        self._nodes.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class MCTSAgent:
+    """
+    Play-phase agent for BangGame(agents={seat: MCTSAgent(...)}) using Monte
+    Carlo Tree Search over the seat's own decisions (which card, which
+    Bang! target, or pass).
+
+    Each iteration deals the cards the seat cannot see (the deck and the
+    other players' hands) at random, walks down the tree by UCB1 from
+    there, then finishes the game with the engine's random play and scores
+    gamma^turns if the seat's faction wins (turns = turns until the game
+    ended), else 0: a quicker win is worth more, so a won position is
+    pressed home instead of every action scoring the same.
+
+    Nodes are keyed by game.observation_hash(), so they only depend on
+    information the seat legally has, and live in an LRU
+    TranspositionTable of at most table_size nodes that is kept from one
+    decision to the next.
+
+    Every decision runs for `iterations` iterations or `time_budget`
+    seconds, whichever ends first (either may be None, not both).
+    last_stats describes the last search, including nodes/sec.
+    """
+
+    def __init__(self, iterations=1000, time_budget=None, c=1.4, table_size=100000, seed=None,
+                 gamma=0.95):
+        if iterations is None and time_budget is None:
+            raise ValueError("need an iteration or a time budget")
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.c = c
+        self.gamma = gamma
+        self.table = TranspositionTable(table_size)
+        self.rng = random.Random(seed)
+        self.last_stats = {}
+        # totals over every search, for throughput reports
+        self.total_nodes_visited = 0
+        self.total_search_time = 0.0
+
+    def choose_action(self, game, player):
+        actions = game.legal_actions(player)
+        if len(actions) == 1:
+            self.last_stats = {}
+            return actions[0]
+
+        seat = player.player_id
+        faction = ROLE_FACTION[player.role]
+        sim, snap = BangGame.rollout_copy(game.snapshot())
+        root_key = game.observation_hash(seat)
+
+        iterations = 0
+        nodes_visited = 0
+        hits_before = self.table.hits
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        while self.iterations is None or iterations < self.iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            sim.restore(snap)
+            sim.rng.seed(self.rng.getrandbits(64))
+            self._determinize(sim, seat)
+            nodes_visited += self._iterate(sim, sim.players[seat], faction)
+            iterations += 1
+        elapsed = time.perf_counter() - start
+        self.total_nodes_visited += nodes_visited
+        self.total_search_time += elapsed
+
+        root = self.table.get(root_key)
+        best = max(actions, key=lambda a: self._rank(root, a))
+        self.last_stats = {
+            "iterations": iterations,
+            "nodes_visited": nodes_visited,
+            "table_size": len(self.table),
+            "table_hits": self.table.hits - hits_before,
+            "elapsed": elapsed,
+            "nodes_per_sec": nodes_visited / elapsed if elapsed > 0 else float("inf"),
+            "root_visits": {a: root.n.get(a, 0) for a in actions} if root else {},
+        }
+        return best
+
+    @staticmethod
+    def _rank(node, action):
+        """
+        Final choice: most visits, then best mean reward, then anything
+        before ACTION_PASS (passing on a tie can stall a won game).
+        """
+        if node is None:
+            return (0, 0.0, action != ACTION_PASS)
+        n = node.n.get(action, 0)
+        return (n, node.w.get(action, 0.0) / n if n else 0.0, action != ACTION_PASS)
+
+    def _determinize(self, game, seat):
+        """
+        Redeal the cards seat cannot see: the deck and the other alive
+        players' hands are pooled, shuffled and dealt back in the same sizes.
+        """
+        others = [p for p in game.players if p.player_id != seat and not p.eliminated]
+        pool = list(game.deck.cards)
+        for p in others:
+            pool.extend(p.hand)
+        game.rng.shuffle(pool)
+        pos = 0
+        for p in others:
+            n = len(p.hand)
+            p.hand.clear()
+            for c in pool[pos:pos + n]:
+                p.hand.append(c)
+            pos += n
+        game.deck.set_piles(pool[pos:], game.deck.discard_pile)
+
+    def _select(self, node, actions):
+        untried = [a for a in actions if a not in node.n]
+        if untried:
+            return self.rng.choice(untried)
+        log_n = math.log(node.visits)
+        c = self.c
+        return max(actions, key=lambda a: node.w[a] / node.n[a] + c * math.sqrt(log_n / node.n[a]))
+
+    def _iterate(self, game, player, faction):
+        """
+        One selection / expansion / rollout / backup pass. Returns the
+        number of tree nodes visited.
+        """
+        seat = player.player_id
+        start_turn = game.turn_count
+        path = []
+        passed = False
+        while not game._check_end_game():
+            key = game.observation_hash(seat)
+            node = self.table.get(key)
+            expanded = node is None
+            if expanded:
+                node = self.table.add(key, Node())
+            action = self._select(node, game.legal_actions(player))
+            path.append((node, action))
+            if action == ACTION_PASS:
+                passed = True
+                break
+            game.apply_action(player, action)
+            if expanded:
+                break
+
+        # rollout: rest of this play phase at random, then the rest of the game
+        if not passed and not game._check_end_game():
+            game._play_phase(player)
+        if not game.game_over:
+            game._end_turn(player)
+        result = game.run_game()
+        reward = self.gamma ** (result.turns - start_turn) if result.winner == faction else 0.0
+
+        for node, action in path:
+            node.visits += 1
+            node.n[action] = node.n.get(action, 0) + 1
+            node.w[action] = node.w.get(action, 0.0) + reward
+        return len(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play one MCTS seat against random play.")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seat", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds per decision")
+    parser.add_argument("--table-size", type=int, default=100000)
+    parser.add_argument("--gamma", type=float, default=0.95, help="reward discount per turn")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    agent = MCTSAgent(iterations=args.iterations, time_budget=args.time_budget,
+                      table_size=args.table_size, seed=args.seed, gamma=args.gamma)
+    wins = {"mcts": 0, "random": 0}
+    for g in range(args.games):
+        # same deal for both modes
+        seed = game_seed(args.seed, g)
+        for mode in ("mcts", "random"):
+            agents = {args.seat: agent} if mode == "mcts" else None
+            game = BangGame(game_number=g + 1, log_level=LogLevel.OFF, seed=seed, agents=agents)
+            faction = ROLE_FACTION[game.players[args.seat].role]
+            wins[mode] += game.run_game().winner == faction
+    print(f"seat {args.seat} faction win rate over {args.games} games: "
+          f"MCTS {wins['mcts'] / args.games:.1%}, random {wins['random'] / args.games:.1%}")
+    if agent.total_search_time:
+        print(f"{agent.total_nodes_visited / agent.total_search_time:.0f} nodes/sec, "
+              f"table {len(agent.table)} nodes")
@@ -0,0 +1,232 @@
+# parallel_sim.py
+
+import argparse
+import csv
+import os
+import random
+import time
+
+from bang_game import BangGame
+from enums import LogLevel
+from game_logger import BufferedGameLogger, CSV_HEADER
+from rng import game_seed
+
+# lists the shards of the last complete run in a log dir, one file name per line
+MANIFEST = "manifest.txt"
+
+# indexed by enums.Faction
+OUTCOME_KEYS = ("Renegade", "Outlaws", "Sheriff/Deputies", "Other", "Capped")
+
+
+def outcome_key(result):
+    """
+    Outcome dictionary key of a run_game() GameResult (or a Faction).
+    """
+    return OUTCOME_KEYS[getattr(result, "winner", result)]
+
+
+def results_to_arrays(results):
+    """
+    Stack GameResults into NumPy arrays:
+      winner             (N,) int8, Faction codes
+      turns              (N,) int32
+      survived_turns     (N, seats) int32
+      elimination_order  (N, seats) int8, padded with -1
+    """
+    import numpy as np
+
+    n = len(results)
+    seats = len(results[0].survived_turns) if n else 0
+    arrays = {
+        "winner": np.fromiter((r.winner for r in results), dtype=np.int8, count=n),
+        "turns": np.fromiter((r.turns for r in results), dtype=np.int32, count=n),
+        "survived_turns": np.array([r.survived_turns for r in results], dtype=np.int32).reshape(n, seats),
+        "elimination_order": np.full((n, seats), -1, dtype=np.int8),
+    }
+    for i, r in enumerate(results):
+        arrays["elimination_order"][i, :len(r.elimination_order)] = r.elimination_order
+    return arrays
+
+
+def tally_results(winners):
+    """
+    Outcome counts keyed by OUTCOME_KEYS from an array of Faction codes
+    (e.g. results_to_arrays(...)["winner"]) or a list of GameResults.
+    """
+    import numpy as np
+
+    if not isinstance(winners, np.ndarray):
+        winners = np.fromiter((getattr(r, "winner", r) for r in winners), dtype=np.int8)
+    counts = np.bincount(winners, minlength=len(OUTCOME_KEYS))
+    return {k: int(v) for k, v in zip(OUTCOME_KEYS, counts)}
+
+
+def _run_chunk(chunk_idx, first_game_id, num_games, seed, log_dir, log_level,
+               max_turns=None, stall_rounds=None):
+    """
+    Worker task: plays num_games games with GameIDs first_game_id.. and
+    writes them to its own shard. Returns (chunk_idx, games, counts, shard).
+    With a base seed, game g is seeded with game_seed(seed, g).
+    """
+    if seed is None:
+        # forked workers inherit the parent's global RNG state => reseed from the OS
+        random.seed()
+
+    counts = dict.fromkeys(OUTCOME_KEYS, 0)
+    shard = None
+    logger = None
+    if log_level != LogLevel.OFF:
+        shard = os.path.join(log_dir, f"shard_{chunk_idx:05d}.csv")
+        # shards belong to one run => don't append to a previous run's file
+        if os.path.exists(shard):
+            os.remove(shard)
+        logger = BufferedGameLogger(shard)
+    try:
+        for i in range(num_games):
+            game_id = first_game_id + i
+            game = BangGame(
+                logger=logger, game_number=game_id, log_level=log_level,
+                seed=None if seed is None else game_seed(seed, game_id)
+            )
+            counts[outcome_key(game.run_game(max_turns, stall_rounds))] += 1
+    finally:
+        if logger:
+            logger.close()
+    return chunk_idx, num_games, counts, shard
+
+
+def run_parallel(num_games, workers=None, chunk_size=100, seed=None,
+                 log_dir="shards", log_level=LogLevel.FULL, progress=None,
+                 max_turns=None, stall_rounds=None):
+    """
+    Spread num_games BangGames over a process pool in chunks of chunk_size.
+    Chunk k plays GameIDs k*chunk_size+1.. so IDs are unique across shards,
+    and with a seed every game is reproducible on its own (rng.game_seed).
+    Outcome counts are merged as chunks finish; progress(done, total, outcomes)
+    is called after each one if given. max_turns / stall_rounds cap every
+    game (see BangGame.run_game); capped games count as "Capped".
+
+    When logging, log_dir/manifest.txt is rewritten at the end with this
+    run's shards, so read_manifest() never picks up shards left over from
+    an earlier (e.g. bigger) run in the same directory.
+
+    Returns (outcomes, shard_paths).
+    """
+    # imported here => single-process users (simulate.py) skip multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    log_level = LogLevel(log_level)
+    manifest = os.path.join(log_dir, MANIFEST)
+    if log_level != LogLevel.OFF:
+        os.makedirs(log_dir, exist_ok=True)
+        # an interrupted run must not leave the previous run's manifest behind
+        if os.path.exists(manifest):
+            os.remove(manifest)
+
+    outcomes = dict.fromkeys(OUTCOME_KEYS, 0)
+    shards = []
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for chunk_idx, start in enumerate(range(0, num_games, chunk_size)):
+            n = min(chunk_size, num_games - start)
+            futures.append(pool.submit(
+                _run_chunk, chunk_idx, start + 1, n, seed, log_dir, log_level,
+                max_turns, stall_rounds
+            ))
+        for fut in as_completed(futures):
+            _, n, counts, shard = fut.result()
+            for k, v in counts.items():
+                outcomes[k] += v
+            if shard:
+                shards.append(shard)
+            done += n
+            if progress:
+                progress(done, num_games, outcomes)
+    shards.sort()
+    if shards:
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.writelines(os.path.basename(s) + "\n" for s in shards)
+    return outcomes, shards
+
+
+def read_manifest(log_dir="shards"):
+    """
+    Shard paths of the last complete run_parallel() run in log_dir.
+    """
+    manifest = os.path.join(log_dir, MANIFEST)
+    if not os.path.exists(manifest):
+        raise ValueError(f"no {MANIFEST} in {log_dir}: pass the shards explicitly")
+    with open(manifest, encoding="utf-8") as f:
+        return [os.path.join(log_dir, line.strip()) for line in f if line.strip()]
+
+
+def merge_shards(shard_paths, out_path):
+    """
+    Concatenate CSV shards into one log. GameIDs are renumbered 1.. in
+    shard order so they stay globally unique even if shards overlap.
+    Returns the number of games written.
+    """
+    next_id = 1
+    with open(out_path, mode="w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(CSV_HEADER)
+        for path in shard_paths:
+            id_map = {}
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header != CSV_HEADER:
+                    raise ValueError(f"{path} does not have the GameLogger header")
+                for row in reader:
+                    new_id = id_map.get(row[0])
+                    if new_id is None:
+                        new_id = id_map[row[0]] = next_id
+                        next_id += 1
+                    row[0] = new_id
+                    writer.writerow(row)
+    return next_id - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel BangGame simulation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="simulate games on a process pool")
+    run.add_argument("--games", type=int, default=1000)
+    run.add_argument("--workers", type=int, default=os.cpu_count())
+    run.add_argument("--chunk-size", type=int, default=100)
+    run.add_argument("--seed", type=int, default=None)
+    run.add_argument("--log-dir", default="shards")
+    run.add_argument("--log-level", choices=[l.name for l in LogLevel], default="FULL")
+    run.add_argument("--merge", metavar="OUT_CSV", help="merge the shards into one log afterwards")
+    run.add_argument("--max-turns", type=int, default=None, help="cap every game at this many turns")
+    run.add_argument("--stall-rounds", type=int, default=None, help="cap games with no damage for this many rounds")
+
+    merge = sub.add_parser("merge", help="merge CSV shards into one log")
+    merge.add_argument("out_csv")
+    merge.add_argument("shards", nargs="*", help="default: the shards in LOG_DIR's manifest")
+    merge.add_argument("--log-dir", default="shards")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        start = time.time()
+        outcomes, shards = run_parallel(
+            args.games, workers=args.workers, chunk_size=args.chunk_size,
+            seed=args.seed, log_dir=args.log_dir, log_level=LogLevel[args.log_level],
+            max_turns=args.max_turns, stall_rounds=args.stall_rounds
+        )
+        elapsed = time.time() - start
+        print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.1f} games/sec, {args.workers} workers)")
+        for k in OUTCOME_KEYS:
+            print(f"{k}: {outcomes[k]}")
+        print(f"Cap-hit rate: {outcomes['Capped'] / args.games:.2%}")
+        if args.merge and shards:
+            print(f"Merged {merge_shards(shards, args.merge)} games into {args.merge}")
+    else:
+        shards = args.shards or read_manifest(args.log_dir)
+        print(f"Merged {merge_shards(shards, args.out_csv)} games into {args.out_csv}")
+
+
+if __name__ == "__main__":
+    main()
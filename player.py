@@ -1,5 +1,7 @@
 from enums import Role
-from card import Card
+from deck import CARD_NAME_CODES
+from hand import Hand
+from zobrist import HAND_KEYS
 
 class Player:
     """
@@ -7,7 +9,7 @@ class Player:
       - role (Sheriff, Deputy, Outlaw, Renegade)
       - character name
       - health, max_health
-      - a hand of Card objects
+      - a Hand of card ids (indexes into deck.CARD_TABLE), typed by name code
       - whether eliminated
       - equipment flags, etc.
     """
@@ -23,7 +25,7 @@ class Player:
             self.max_health += 1
 
         self.health = self.max_health
-        self.hand = []
+        self.hand = Hand(key=CARD_NAME_CODES.__getitem__, zkeys=HAND_KEYS[player_id])
         self.eliminated = False
 
         # Equipment
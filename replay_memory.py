@@ -0,0 +1,169 @@
+# replay_memory.py
+
+import numpy as np
+
+
+class ReplayMemory:
+    """
+    Fixed-size ring buffer of (state, action, reward, next_state, done)
+    transitions in preallocated NumPy arrays, one row per transition:
+    insertion is O(1), the oldest transition is overwritten once the
+    buffer is full, and sample() draws a batch of rows with one fancy index.
+
+    sample() returns (states, actions, rewards, next_states, dones,
+    indices, weights); the weights are all 1 here (see
+    PrioritizedReplayMemory) and update_priorities() does nothing, so both
+    memories can be used the same way.
+    """
+
+    def __init__(self, capacity, state_size, state_dtype=np.float32, rng=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=state_dtype)
+        self.next_states = np.zeros((capacity, state_size), dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._next = 0
+        self._size = 0
+
+    def push(self, state, action, reward, next_state, done):
+        i = self._next
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """
+        Insert one transition per row (e.g. one vector-env step).
+        Returns the rows written.
+        """
+        n = len(actions)
+        if n > self.capacity:
+            raise ValueError(f"batch of {n} transitions does not fit in capacity {self.capacity}")
+        idx = (self._next + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self._next = int((self._next + n) % self.capacity)
+        self._size = min(self._size + n, self.capacity)
+        return idx
+
+    def sample(self, batch_size):
+        idx = self.rng.integers(self._size, size=batch_size)
+        return self._gather(idx) + (idx, np.ones(batch_size, dtype=np.float32))
+
+    def update_priorities(self, indices, td_errors):
+        pass
+
+    def _gather(self, idx):
+        return (self.states[idx], self.actions[idx], self.rewards[idx],
+                self.next_states[idx], self.dones[idx])
+
+    @property
+    def nbytes(self):
+        return (self.states.nbytes + self.next_states.nbytes + self.actions.nbytes
+                + self.rewards.nbytes + self.dones.nbytes)
+
+    def __len__(self):
+        return self._size
+
+
+class SumTree:
+    """
+    Binary tree over capacity leaves where every node holds the sum of its
+    children, in one flat array (root at 1, children of i at 2i and 2i+1).
+    Batched updates and prefix-sum searches are O(batch * log capacity)
+    and vectorized level by level.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, values):
+        nodes = np.asarray(indices) + self.leaves
+        self.tree[nodes] = values
+        # all leaves sit on the same level => walk up one level at a time
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """
+        Leaf index for each value in [0, total): the first leaf whose
+        running sum exceeds it.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self.leaves, self.capacity - 1)
+
+    def __getitem__(self, indices):
+        return self.tree[np.asarray(indices) + self.leaves]
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """
+    ReplayMemory with proportional prioritized sampling: transition i is
+    drawn with probability p_i^alpha / sum_j p_j^alpha, p_i being its last
+    |TD error| + eps (new transitions get the highest priority seen so far).
+    sample() also returns importance weights (N * P(i))^-beta, scaled to a
+    maximum of 1, to correct the bias; raise beta towards 1 over training.
+    """
+
+    def __init__(self, capacity, state_size, alpha=0.6, beta=0.4, eps=1e-6,
+                 state_dtype=np.float32, rng=None):
+        super().__init__(capacity, state_size, state_dtype=state_dtype, rng=rng)
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        i = super().push(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        idx = super().push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(idx, self.max_priority ** self.alpha)
+        return idx
+
+    def sample(self, batch_size):
+        # one draw per equal slice of the total priority (stratified)
+        total = self.tree.total
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        bounds = np.minimum(bounds, np.nextafter(total, 0))
+        idx = self.tree.find(bounds)
+        probs = self.tree[idx] / total
+        weights = (self._size * probs) ** -self.beta
+        weights /= weights.max()
+        return self._gather(idx) + (idx, weights.astype(np.float32))
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
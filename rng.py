@@ -0,0 +1,79 @@
+# rng.py
+
+import hashlib
+import random
+
+
+class NumpyRandom:
+    """
+    Wraps a numpy.random.Generator so it offers the random.Random calls
+    the engine makes (random, randrange, choice, shuffle, sample, get/setstate).
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def random(self):
+        return float(self.generator.random())
+
+    def randrange(self, n):
+        return int(self.generator.integers(n))
+
+    def choice(self, seq):
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def shuffle(self, x):
+        self.generator.shuffle(x)
+
+    def sample(self, population, k):
+        idx = self.generator.choice(len(population), size=k, replace=False)
+        return [population[int(i)] for i in idx]
+
+    def getstate(self):
+        return self.generator.bit_generator.state
+
+    def setstate(self, state):
+        self.generator.bit_generator.state = state
+
+
+def make_rng(seed=None):
+    """
+    Build the RNG a game uses from:
+      - a random.Random (used as-is)
+      - a numpy.random.Generator (wrapped in NumpyRandom)
+      - an int/str seed
+      - None => seeded from the global random module, so random.seed()
+        still makes a whole run reproducible.
+    """
+    if isinstance(seed, (random.Random, NumpyRandom)):
+        return seed
+    if hasattr(seed, "bit_generator"):
+        return NumpyRandom(seed)
+    if seed is None:
+        seed = random.getrandbits(64)
+    return random.Random(seed)
+
+
+def game_seed(base_seed, game_id):
+    """
+    Seed for one game of a batch. Derived by hashing, so any single game
+    can be replayed alone with BangGame(seed=game_seed(base_seed, game_id))
+    and neighbouring base seeds don't share games.
+    """
+    digest = hashlib.sha256(f"{base_seed}:{game_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def rng_from_state(state):
+    """
+    Rebuild an RNG from its getstate() output (a random.Random state tuple
+    or a NumPy bit-generator state dict).
+    """
+    if isinstance(state, dict):
+        import numpy as np
+        bit_generator = getattr(np.random, state["bit_generator"])()
+        rng = NumpyRandom(np.random.Generator(bit_generator))
+    else:
+        rng = random.Random()
+    rng.setstate(state)
+    return rng
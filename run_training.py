@@ -1,16 +1,39 @@
 # run_training.py
 
 import random
-import numpy as np
 import time
-from datetime import datetime
-from tqdm import tqdm  # for progress bar
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from collections import deque
 
-from bang_game import BangGame  # assumes bang_game.py has roles = [Sheriff, Renegade, Outlaw, Outlaw, Deputy]
+from bang_game import NUM_ACTIONS
+from parallel_sim import tally_results
+
+# numpy / torch / tqdm (and the modules built on them) take seconds to import,
+# so they are only loaded once an agent is built or training starts
+np = torch = nn = optim = tqdm = None
+BangVectorEnv = ReplayMemory = PrioritizedReplayMemory = None
+
+
+def load_ml_deps():
+    """
+    Import the ML dependencies into this module (no-op after the first call).
+    """
+    global np, torch, nn, optim, tqdm, BangVectorEnv, ReplayMemory, PrioritizedReplayMemory
+    if torch is not None:
+        return
+    import numpy as np
+    import torch
+    import torch.nn as nn
+    import torch.optim as optim
+    from tqdm import tqdm  # for progress bar
+    from vector_env import BangVectorEnv
+    from replay_memory import ReplayMemory, PrioritizedReplayMemory
+
+
+def __getattr__(name):
+    # build_state_dict / encode_state used to live here => re-exported lazily
+    if name in ("build_state_dict", "encode_state"):
+        import state_encoder
+        return getattr(state_encoder, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class DQNAgent:
@@ -24,7 +47,11 @@ class DQNAgent:
         epsilon_min=0.01,
         epsilon_decay=0.995,
         memory_size=2000,
+        prioritized=False,
+        alpha=0.6,
+        beta=0.4,
     ):
+        load_ml_deps()
         self.state_size = state_size
         self.action_size = action_size
         self.gamma = gamma
@@ -32,7 +59,11 @@ class DQNAgent:
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
 
-        self.memory = deque(maxlen=memory_size)
+        # preallocated ring buffer; prioritized => sum-tree sampling + importance weights
+        if prioritized:
+            self.memory = PrioritizedReplayMemory(memory_size, state_size, alpha=alpha, beta=beta)
+        else:
+            self.memory = ReplayMemory(memory_size, state_size)
 
         self.model = nn.Sequential(
             nn.Linear(self.state_size, 128),
@@ -42,10 +73,13 @@ class DQNAgent:
             nn.Linear(128, self.action_size)
         )
         self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
-        self.criterion = nn.MSELoss()
+        self.criterion = nn.MSELoss(reduction="none")
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.push(state, action, reward, next_state, done)
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
 
     def act(self, state, valid_actions=None):
         # Epsilon-greedy
@@ -66,83 +100,84 @@ class DQNAgent:
             else:
                 return int(np.argmax(q_values))
 
+    def act_batch(self, states, masks):
+        """
+        Epsilon-greedy actions for a batch of states (one row each) in a
+        single forward pass; masks (same rows, bool over actions) restricts
+        both the random and the greedy choice to legal actions.
+        """
+        states = np.asarray(states, dtype=np.float32)
+        masks = np.asarray(masks, dtype=bool)
+        n = len(states)
+        explore = np.random.rand(n) < self.epsilon
+        actions = np.zeros(n, dtype=np.int64)
+        if explore.any():
+            # uniform over each row's legal actions
+            noise = np.random.rand(int(explore.sum()), self.action_size) * masks[explore]
+            actions[explore] = noise.argmax(axis=1)
+        greedy = ~explore
+        if greedy.any():
+            with torch.no_grad():
+                q_values = self.model(torch.from_numpy(states[greedy])).numpy()
+            q_values[~masks[greedy]] = -np.inf
+            actions[greedy] = q_values.argmax(axis=1)
+        return actions
+
     def replay(self, batch_size=32):
+        """
+        One DQN update on a random minibatch, fully batched: the targets
+        come from one forward pass over the next states, then one gather,
+        one loss and one optimizer step. Returns the loss (None until the
+        memory holds batch_size transitions). With prioritized replay the
+        loss is importance-weighted and the sampled priorities are updated
+        with the new TD errors.
+        """
         if len(self.memory) < batch_size:
             return
 
-        minibatch = random.sample(self.memory, batch_size)
-        for state, action, reward, next_state, done in minibatch:
-            target = reward
-            if not done:
-                next_tensor = torch.tensor(next_state, dtype=torch.float32).unsqueeze(0)
-                future_q = self.model(next_tensor).detach().max(dim=1)[0].item()
-                target += self.gamma * future_q
-
-            state_tensor = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
-            current_q_values = self.model(state_tensor).detach().numpy().squeeze()
-
-            current_q_values[action] = target
-            target_arr = np.array(current_q_values, dtype=np.float32)
-            target_tensor = torch.from_numpy(target_arr).unsqueeze(0)
-
-            self.optimizer.zero_grad()
-            output = self.model(state_tensor)
-            loss = self.criterion(output, target_tensor)
-            loss.backward()
-            self.optimizer.step()
+        states, actions, rewards, next_states, dones, indices, weights = self.memory.sample(batch_size)
+        states = torch.from_numpy(states)
+        actions = torch.from_numpy(actions)
+        rewards = torch.from_numpy(rewards)
+        next_states = torch.from_numpy(next_states)
+        dones = torch.from_numpy(dones.astype(np.float32))
+        weights = torch.from_numpy(weights)
+
+        with torch.no_grad():
+            future_q = self.model(next_states).max(dim=1)[0]
+        targets = rewards + self.gamma * future_q * (1.0 - dones)
+
+        q_taken = self.model(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        loss = (weights * self.criterion(q_taken, targets)).mean()
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+        self.memory.update_priorities(indices, (targets - q_taken.detach()).numpy())
 
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
+        return loss.item()
 
 
-def build_state_dict(game):
-    """
-    Minimal function to gather the game state for encoding.
-    """
-    st = {
-        "turn": game.turn_count,
-        "current_player": game.current_player_idx,
-        "players": [],
-        "deck_size": len(game.deck.cards),
-        "discard_size": len(game.deck.discard_pile)
-    }
-    for p in game.players:
-        st_p = {
-            "health": p.health,
-            "hand_size": len(p.hand),
-            "eliminated": p.eliminated
-        }
-        st["players"].append(st_p)
-    return st
-
-def encode_state(game_state):
-    """
-    Convert that dictionary into a numeric vector.
-    """
-    turn = game_state["turn"]
-    cp = game_state["current_player"]
-    deck_s = game_state["deck_size"]
-    disc_s = game_state["discard_size"]
-
-    arr = [turn, cp, deck_s, disc_s]
-    for pinfo in game_state["players"]:
-        arr += [pinfo["health"], int(pinfo["eliminated"]), pinfo["hand_size"]]
-    return np.array(arr, dtype=np.float32)
-
-def train_bang_agents(num_episodes=20, turn_cap=100):
+def train_bang_agents(num_episodes=20, turn_cap=100, agent_seat=0, batch_size=32, replay_every=4,
+                      num_envs=8, seed=None, obs_version=1):
     """
     We ensure each game has exactly 5 players with roles:
         1 Sheriff, 1 Renegade, 2 Outlaws, 1 Deputy
     By referencing a bang_game.py that has that distribution.
     We add a progress bar for time estimate using tqdm.
+
+    The DQN agent plays agent_seat in num_envs games at once (BangVectorEnv):
+    one batched forward pass picks the actions for all of them, every
+    play-phase decision is one transition in its replay memory, and it
+    trains on a minibatch every replay_every vector steps. The other seats
+    play at random. Games running past turn_cap turns are cut off and count as "Capped".
     """
-    # We'll create a dummy game to measure state_size
-    dummy_game = BangGame(verbose=False, game_number=0)
-    dummy_state = build_state_dict(dummy_game)
-    dummy_vec = encode_state(dummy_state)
-    state_size = len(dummy_vec)
-    action_size = 11  # 0 => pass, 1..10 => cards in hand
+    load_ml_deps()
+    env = BangVectorEnv(num_envs, agent_seat=agent_seat, seed=seed, turn_cap=turn_cap, obs_version=obs_version)
+    state_size = env.observations.shape[1]
+    action_size = NUM_ACTIONS  # pass, Bang! at a seat, or a card type (see bang_game.ACTION_*)
 
     agent = DQNAgent(
         state_size=state_size,
@@ -155,58 +190,41 @@ def train_bang_agents(num_episodes=20, turn_cap=100):
         memory_size=5000,
     )
 
-    outcomes = {
-        "Renegade": 0,
-        "Outlaws": 0,
-        "Sheriff/Deputies": 0,
-        "Other": 0
-    }
-
-    # We'll do a progress bar for the episodes
-    import time
-    from tqdm import tqdm
+    results = []
 
     start_time = time.time()
+    steps = 0
+    episodes = 0
+    states, masks = env.reset()
+    # episodes decided before the agent's first move count too
+    finished = list(env.finished)
 
-    for episode in tqdm(range(num_episodes), desc="Training Progress", unit="episode"):
-        game = BangGame(verbose=False, game_number=episode+1)
-        # This game presumably has roles = [Sheriff, Renegade, Outlaw, Outlaw, Deputy]
-        # guaranteed by bang_game.py
-
-        # We'll do a naive approach: let run_game finish
+    with tqdm(total=num_episodes, desc="Training Progress", unit="episode") as progress:
         while True:
-            if game.turn_count > turn_cap:
-                print(f"Episode {episode+1} => turn cap exceeded => ignoring outcome.")
-                break
-
-            current_p = game.players[game.current_player_idx]
-            if current_p.eliminated:
-                game._next_player()
-                if game._check_end_game():
+            for _, result in finished:
+                if episodes == num_episodes:
                     break
-                continue
-
-            outcome = game.run_game()
-            break
-
-        outcome = game._print_winner()
-        print(f"Episode {episode+1} ended after {game.turn_count} turns => {outcome}")
-
-        if "Renegade" in outcome:
-            outcomes["Renegade"] += 1
-        elif "Outlaws" in outcome:
-            outcomes["Outlaws"] += 1
-        elif "Sheriff and Deputies" in outcome:
-            outcomes["Sheriff/Deputies"] += 1
-        else:
-            outcomes["Other"] += 1
+                episodes += 1
+                progress.update(1)
+                print(f"Episode {episodes} ended after {result.turns} turns => {result.message}")
+                results.append(result)
+            if episodes == num_episodes:
+                break
 
-        # Here you might do agent training in detail (step-by-step),
-        # or sample from memory replay, etc. We'll keep it minimal here.
+            actions = agent.act_batch(states, masks)
+            next_states, masks, rewards, dones = env.step(actions)
+            agent.remember_batch(states, actions, rewards, next_states, dones)
+            states = next_states
+            finished = env.finished
+            steps += 1
+            if steps % replay_every == 0:
+                agent.replay(batch_size)
 
     end_time = time.time()
     total_time = end_time - start_time
-    print(f"Training took {total_time:.2f} seconds total.")
+    print(f"Training took {total_time:.2f} seconds total ({steps * num_envs} agent steps).")
+    outcomes = tally_results(results)
+    print(f"Cap-hit rate: {outcomes['Capped'] / max(episodes, 1):.2%} (turn cap {turn_cap})")
 
     return outcomes
 
@@ -217,3 +235,4 @@ if __name__ == "__main__":
     print("Outlaws:", results["Outlaws"])
     print("Sheriff/Deputies:", results["Sheriff/Deputies"])
     print("Other:", results["Other"])
+    print("Capped:", results["Capped"])
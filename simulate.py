@@ -0,0 +1,82 @@
+# simulate.py
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import sys
+
+from bang_game import BangGame
+from enums import LogLevel
+from game_logger import BufferedGameLogger
+from parallel_sim import OUTCOME_KEYS, outcome_key, run_parallel, merge_shards
+from rng import game_seed
+
+# Simulation only: nothing here (or in the modules above) imports torch or
+# numpy, so the first game starts well under a second after launch.
+
+
+def simulate(num_games, seed=None, log_level=LogLevel.OFF, log_path="game_log.csv",
+             max_turns=None, stall_rounds=None):
+    """
+    Play num_games BangGames in this process with random play. With a seed,
+    game g is seeded with game_seed(seed, g) (same deals as parallel_sim).
+    max_turns / stall_rounds cap every game (see BangGame.run_game).
+    Returns the outcome counts keyed by OUTCOME_KEYS.
+    """
+    log_level = LogLevel(log_level)
+    outcomes = dict.fromkeys(OUTCOME_KEYS, 0)
+    logger = BufferedGameLogger(log_path) if log_level != LogLevel.OFF else None
+    try:
+        for game_id in range(1, num_games + 1):
+            game = BangGame(
+                logger=logger, game_number=game_id, log_level=log_level,
+                seed=None if seed is None else game_seed(seed, game_id)
+            )
+            outcomes[outcome_key(game.run_game(max_turns, stall_rounds))] += 1
+    finally:
+        if logger:
+            logger.close()
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate BangGames with random play (no ML dependencies).")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-level", choices=[l.name for l in LogLevel], default="OFF")
+    parser.add_argument("--workers", type=int, default=1, help="more than 1 => parallel_sim process pool")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--log", default="game_log.csv", help="log file (1 worker)")
+    parser.add_argument("--log-dir", default="shards", help="shard directory (several workers)")
+    parser.add_argument("--merge", metavar="OUT_CSV", help="merge the shards into one log afterwards")
+    parser.add_argument("--max-turns", type=int, default=None, help="cap every game at this many turns")
+    parser.add_argument("--stall-rounds", type=int, default=None, help="cap games with no damage for this many rounds")
+    args = parser.parse_args()
+    log_level = LogLevel[args.log_level]
+
+    startup = time.perf_counter() - _START
+    print(f"Startup: {startup * 1000:.0f} ms (torch imported: {'torch' in sys.modules})")
+    start = time.perf_counter()
+    if args.workers > 1:
+        outcomes, shards = run_parallel(
+            args.games, workers=args.workers, chunk_size=args.chunk_size,
+            seed=args.seed, log_dir=args.log_dir, log_level=log_level,
+            max_turns=args.max_turns, stall_rounds=args.stall_rounds
+        )
+    else:
+        outcomes = simulate(args.games, seed=args.seed, log_level=log_level, log_path=args.log,
+                            max_turns=args.max_turns, stall_rounds=args.stall_rounds)
+        shards = []
+    elapsed = time.perf_counter() - start
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.1f} games/sec, {args.workers} workers)")
+    for k in OUTCOME_KEYS:
+        print(f"{k}: {outcomes[k]}")
+    print(f"Cap-hit rate: {outcomes['Capped'] / args.games:.2%}")
+    if args.merge and shards:
+        print(f"Merged {merge_shards(shards, args.merge)} games into {args.merge}")
+
+
+if __name__ == "__main__":
+    main()
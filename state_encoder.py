@@ -0,0 +1,136 @@
+# state_encoder.py
+
+import numpy as np
+
+from bang_game import NUM_ACTIONS
+from card import CARD_NAMES
+from deck import CARD_NAME_CODES
+
+
+def build_state_dict(game):
+    """
+    Minimal function to gather the game state for encoding.
+    """
+    st = {
+        "turn": game.turn_count,
+        "current_player": game.current_player_idx,
+        "players": [],
+        "deck_size": len(game.deck.cards),
+        "discard_size": len(game.deck.discard_pile)
+    }
+    for p in game.players:
+        st_p = {
+            "health": p.health,
+            "hand_size": len(p.hand),
+            "eliminated": p.eliminated
+        }
+        st["players"].append(st_p)
+    return st
+
+def encode_state(game_state):
+    """
+    Convert that dictionary into a numeric vector.
+    """
+    turn = game_state["turn"]
+    cp = game_state["current_player"]
+    deck_s = game_state["deck_size"]
+    disc_s = game_state["discard_size"]
+
+    arr = [turn, cp, deck_s, disc_s]
+    for pinfo in game_state["players"]:
+        arr += [pinfo["health"], int(pinfo["eliminated"]), pinfo["hand_size"]]
+    return np.array(arr, dtype=np.float32)
+
+# Feature layouts. Version 1 is the original 19 features (encode_state);
+# later versions only append, so a model keeps working with the version
+# it was trained on.
+#   v1: turn, current player, deck size, discard size,
+#       then per seat: health, eliminated, hand size
+#   v2: v1 + observer seat one-hot (5) + observer's hand as counts per
+#       card type (len(CARD_NAMES)) + per seat: weapon range, mustang,
+#       scope, barrel, in jail, dynamite
+NUM_SEATS = 5
+V1_SIZE = 4 + 3 * NUM_SEATS
+STATE_SIZES = {
+    1: V1_SIZE,
+    2: V1_SIZE + NUM_SEATS + len(CARD_NAMES) + 6 * NUM_SEATS,
+}
+LATEST_VERSION = max(STATE_SIZES)
+WEAPON_RANGES = {None: 1, "Volcanic": 1, "Schofield": 2, "Remington": 3, "Rev. Carbine": 4, "Winchester": 5}
+
+
+def state_size(version=1):
+    if version not in STATE_SIZES:
+        raise ValueError(f"unknown encoding version {version}; known: {sorted(STATE_SIZES)}")
+    return STATE_SIZES[version]
+
+def encode_into(game, out, version=1, seat=None):
+    """
+    Write the features of game straight into out, a float32 row of
+    state_size(version) (e.g. one row of a preallocated batch), without
+    building any dict or list. seat is the observer for version >= 2
+    (default: the step() seat, else the current player). Returns out.
+    """
+    if len(out) != state_size(version):
+        raise ValueError(f"row has {len(out)} slots, encoding v{version} needs {state_size(version)}")
+    out[0] = game.turn_count
+    out[1] = game.current_player_idx
+    out[2] = len(game.deck.cards)
+    out[3] = len(game.deck.discard_pile)
+    i = 4
+    for p in game.players:
+        out[i] = p.health
+        out[i + 1] = p.eliminated
+        out[i + 2] = len(p.hand)
+        i += 3
+    if version == 1:
+        return out
+
+    if seat is None:
+        seat = game.env_seat if game.env_seat is not None else game.current_player_idx
+    out[i:i + NUM_SEATS] = 0
+    out[i + seat] = 1
+    i += NUM_SEATS
+    out[i:i + len(CARD_NAMES)] = 0
+    for c in game.players[seat].hand:
+        out[i + CARD_NAME_CODES[c]] += 1
+    i += len(CARD_NAMES)
+    for p in game.players:
+        out[i] = WEAPON_RANGES.get(p.weapon, 1)
+        out[i + 1] = p.mustang
+        out[i + 2] = p.scope
+        out[i + 3] = p.barrel
+        out[i + 4] = p.in_jail
+        out[i + 5] = p.dynamite
+        i += 6
+    return out
+
+def encode_batch(games, out=None, version=1, seats=None):
+    """
+    Encode many games into the rows of out, an (N, state_size(version))
+    float32 array (allocated if not given). seats: observer per game.
+    """
+    if out is None:
+        out = np.empty((len(games), state_size(version)), dtype=np.float32)
+    for row, game in enumerate(games):
+        encode_into(game, out[row], version, None if seats is None else seats[row])
+    return out
+
+def encode_game(game, version=1, seat=None):
+    """
+    Observation vector of a BangGame (what BangGame.step returns).
+    """
+    return encode_into(game, np.empty(state_size(version), dtype=np.float32), version, seat)
+
+def action_mask(actions, out=None):
+    """
+    Boolean mask over the NUM_ACTIONS action codes, True for the given ones
+    (written into out if given).
+    """
+    if out is None:
+        out = np.zeros(NUM_ACTIONS, dtype=bool)
+    else:
+        out[:] = False
+    for a in actions:
+        out[a] = True
+    return out
@@ -0,0 +1,150 @@
+# vector_env.py
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from bang_game import BangGame, NUM_ACTIONS
+from enums import LogLevel
+from rng import game_seed
+from state_encoder import encode_into, action_mask, state_size
+
+
+class BangVectorEnv:
+    """
+    num_envs BangGames stepped together through BangGame.reset()/step(),
+    the caller playing agent_seat in every one of them.
+
+    reset() and step(actions) return stacked arrays, one row per game:
+      observations (num_envs, state_size) float32
+      masks        (num_envs, NUM_ACTIONS) bool, legal actions
+      rewards      (num_envs,) float32            (step only)
+      dones        (num_envs,) bool               (step only)
+    A finished game is reset at once, so its row already holds the first
+    decision of the next game; the finished games' outcomes are in
+    self.finished after each step (list of (env index, GameResult)).
+    Games are cut off after turn_cap turns, or after stall_rounds rounds
+    without damage, and end Capped (done, reward 0; see BangGame.run_game).
+
+    With a seed, episode n (counted over all envs) is dealt from
+    game_seed(seed, n), so runs are reproducible. obs_version picks the
+    state_encoder layout; observations are encoded straight into the
+    stacked array.
+    """
+
+    def __init__(self, num_envs, agent_seat=0, seed=None, log_level=LogLevel.OFF,
+                 logger=None, turn_cap=None, obs_version=1, stall_rounds=None):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        self.num_envs = num_envs
+        self.agent_seat = agent_seat
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.turn_cap = turn_cap
+        self.stall_rounds = stall_rounds
+        self.obs_version = obs_version
+        self.games = [BangGame(log_level=log_level, logger=logger) for _ in range(num_envs)]
+        self.episodes = 0
+        self.finished = []
+
+        self.observations = np.zeros((num_envs, state_size(obs_version)), dtype=np.float32)
+        self.masks = np.zeros((num_envs, NUM_ACTIONS), dtype=bool)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+    def _reset_env(self, i):
+        """
+        Deal games in env i until one gives the agent seat a decision.
+        """
+        game = self.games[i]
+        while True:
+            self.episodes += 1
+            game.reset(seed=game_seed(self.seed, self.episodes), agent_seat=self.agent_seat,
+                       game_number=self.episodes, obs_version=self.obs_version, observe=False,
+                       max_turns=self.turn_cap, stall_rounds=self.stall_rounds)
+            if not game.game_over:
+                break
+            self.finished.append((i, game.outcome))
+        self._observe(i)
+
+    def _observe(self, i):
+        game = self.games[i]
+        encode_into(game, self.observations[i], self.obs_version, self.agent_seat)
+        action_mask(game.legal_action_list(), self.masks[i])
+
+    def reset(self):
+        self.finished = []
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        return self.observations.copy(), self.masks.copy()
+
+    def step(self, actions):
+        self.finished = []
+        for i, game in enumerate(self.games):
+            _, _, reward, done = game.step(int(actions[i]), observe=False)
+            self.rewards[i] = reward
+            self.dones[i] = done
+            if done:
+                self.finished.append((i, game.outcome))
+                self._reset_env(i)
+            else:
+                self._observe(i)
+        return self.observations.copy(), self.masks.copy(), self.rewards.copy(), self.dones.copy()
+
+
+def random_actions(masks, rng):
+    """
+    One uniformly random legal action per row of masks.
+    """
+    return (rng.random(masks.shape) * masks).argmax(axis=1)
+
+
+def check_snapshots(games, seat=0, seed=0):
+    """
+    Play games random step() episodes and, at every decision, check that
+    restoring a snapshot into the game (and into a clone) and stepping again
+    reproduces the original step. Raises ValueError on the first mismatch.
+    """
+    rng = random.Random(seed)
+    game = BangGame(log_level=LogLevel.OFF)
+    for g in range(games):
+        game.reset(seed=game_seed(seed, g), agent_seat=seat)
+        done = game.game_over
+        while not done:
+            snap, copy = game.snapshot(), game.clone()
+            action = rng.choice(game.legal_action_list())
+            obs, mask, reward, done = game.step(action)
+            after = game.snapshot()
+            game.restore(snap)
+            for other in (game, copy):
+                o, m, r, d = other.step(action)
+                if (other.snapshot() != after or (r, d) != (reward, done)
+                        or not (np.array_equal(o, obs) and np.array_equal(m, mask))):
+                    raise ValueError(f"snapshot round trip diverged in game {g}, turn {game.turn_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Step K BangGames with random legal actions and report decisions/sec.")
+    parser.add_argument("--envs", type=int, default=32)
+    parser.add_argument("--steps", type=int, default=2000, help="vector steps")
+    parser.add_argument("--seat", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-snapshots", type=int, metavar="GAMES", default=0,
+                        help="first check snapshot/restore round trips of step() over this many games")
+    args = parser.parse_args()
+
+    if args.check_snapshots:
+        check_snapshots(args.check_snapshots, seat=args.seat, seed=args.seed)
+        print(f"snapshot round trips OK over {args.check_snapshots} games")
+
+    env = BangVectorEnv(args.envs, agent_seat=args.seat, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    obs, masks = env.reset()
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        obs, masks, rewards, dones = env.step(random_actions(masks, rng))
+        episodes += len(env.finished)
+    elapsed = time.perf_counter() - start
+    print(f"{args.steps * args.envs / elapsed:.0f} decisions/sec, {episodes} episodes finished")
@@ -0,0 +1,139 @@
+# win_probability.py
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from bang_game import BangGame
+from parallel_sim import OUTCOME_KEYS, outcome_key
+from rng import game_seed
+
+FACTIONS = ("Sheriff/Deputies", "Outlaws", "Renegade")
+
+
+def _rollout_batch(snap, base_seed, first, count):
+    """
+    Play count random playouts from snap, rollout i seeded with
+    game_seed(base_seed, i). Returns outcome counts keyed like OUTCOME_KEYS.
+    """
+    game, snap = BangGame.rollout_copy(snap)
+    counts = dict.fromkeys(OUTCOME_KEYS, 0)
+    for i in range(first, first + count):
+        game.restore(snap)
+        game.rng.seed(game_seed(base_seed, i))
+        counts[outcome_key(game.run_game())] += 1
+    return counts
+
+
+def wilson_interval(wins, n, z=1.96):
+    """
+    Wilson score interval (low, high) for wins out of n. Unlike the Wald
+    interval it keeps a non-zero width when every rollout went the same way.
+    """
+    if not n:
+        return 0.0, 1.0
+    p = wins / n
+    z2 = z * z
+    center = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = z / (1 + z2 / n) * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _summary(counts, n, z):
+    probs = {}
+    intervals = {}
+    for f in FACTIONS:
+        probs[f] = counts[f] / n if n else 0.0
+        intervals[f] = wilson_interval(counts[f], n, z)
+    return probs, intervals
+
+
+def _halfwidths(intervals):
+    return {f: (high - low) / 2 for f, (low, high) in intervals.items()}
+
+
+def estimate_win_probability(game, budget=20000, workers=None, batch_size=250,
+                             ci_halfwidth=0.01, z=1.96, min_rollouts=500, seed=None):
+    """
+    Estimate each faction's chance to win from the current position of a
+    live BangGame by random playouts of the run_game logic (the game itself
+    is not modified). Take the position between turns.
+
+    Rollouts run in batches on a process pool (workers=1 => in-process) and
+    stop early once every faction's Wilson confidence half-width is at most
+    ci_halfwidth (after at least min_rollouts), or when budget is spent.
+
+    Returns a dict:
+      probabilities   {faction: p}
+      ci              {faction: (low, high)} Wilson interval at z
+      ci_halfwidth    {faction: (high - low) / 2}
+      rollouts        number of playouts done
+      rollouts_per_sec
+      converged       True if stopped by the confidence target
+      outcomes        raw counts (including "Other")
+    """
+    snap = game.snapshot()
+    base_seed = random.getrandbits(64) if seed is None else seed
+    workers = workers or os.cpu_count() or 1
+
+    counts = dict.fromkeys(OUTCOME_KEYS, 0)
+    done = 0
+    converged = False
+    start = time.perf_counter()
+
+    def add(batch):
+        nonlocal done
+        for k, v in batch.items():
+            counts[k] += v
+        done += sum(batch.values())
+
+    def target_reached():
+        if done < min_rollouts:
+            return False
+        _, ci = _summary(counts, done, z)
+        return max(_halfwidths(ci).values()) <= ci_halfwidth
+
+    if game._check_end_game():
+        # already decided => nothing to roll out
+        counts[outcome_key(game._winner())] = 1
+        done = 1
+        converged = True
+    elif workers == 1:
+        for first in range(0, budget, batch_size):
+            add(_rollout_batch(snap, base_seed, first, min(batch_size, budget - first)))
+            if target_reached():
+                converged = True
+                break
+    else:
+        submitted = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            # keep only a couple of batches per worker in flight so an early
+            # stop doesn't leave a long queue of wasted work
+            while submitted < budget or pending:
+                while submitted < budget and len(pending) < 2 * workers:
+                    n = min(batch_size, budget - submitted)
+                    pending.add(pool.submit(_rollout_batch, snap, base_seed, submitted, n))
+                    submitted += n
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    add(fut.result())
+                if target_reached():
+                    converged = True
+                    for fut in pending:
+                        fut.cancel()
+                    break
+
+    elapsed = time.perf_counter() - start
+    probs, ci = _summary(counts, done, z)
+    return {
+        "probabilities": probs,
+        "ci": ci,
+        "ci_halfwidth": _halfwidths(ci),
+        "rollouts": done,
+        "rollouts_per_sec": done / elapsed if elapsed > 0 else float("inf"),
+        "converged": converged,
+        "outcomes": counts,
+    }
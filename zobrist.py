@@ -0,0 +1,104 @@
+# zobrist.py
+
+import random
+
+from character_data import CHARACTERS
+from deck import NUM_CARDS
+
+# Fixed seed => the same keys in every process, so hashes can be compared
+# across workers and runs.
+ZOBRIST_SEED = 0x5EED_BA9E
+NUM_SEATS = 5
+MAX_HEALTH = 16
+MAX_COUNT = NUM_CARDS + 1     # equipment / Bang!s used / hand sizes
+
+_rng = random.Random(ZOBRIST_SEED)
+
+
+def _keys(n):
+    return tuple(_rng.getrandbits(64) for _ in range(n))
+
+
+# card locations
+DECK_KEYS = _keys(NUM_CARDS)
+DISCARD_KEYS = _keys(NUM_CARDS)
+HAND_KEYS = tuple(_keys(NUM_CARDS) for _ in range(NUM_SEATS))
+
+# per-seat state
+WEAPONS = (None, "Volcanic", "Schofield", "Remington", "Rev. Carbine", "Winchester")
+WEAPON_INDEX = {w: i for i, w in enumerate(WEAPONS)}
+HEALTH_KEYS = tuple(_keys(MAX_HEALTH) for _ in range(NUM_SEATS))
+ELIMINATED_KEYS = _keys(NUM_SEATS)
+WEAPON_KEYS = tuple(_keys(len(WEAPONS)) for _ in range(NUM_SEATS))
+MUSTANG_KEYS = tuple(_keys(MAX_COUNT) for _ in range(NUM_SEATS))
+SCOPE_KEYS = tuple(_keys(MAX_COUNT) for _ in range(NUM_SEATS))
+BARREL_KEYS = tuple(_keys(MAX_COUNT) for _ in range(NUM_SEATS))
+JAIL_KEYS = _keys(NUM_SEATS)
+DYNAMITE_KEYS = _keys(NUM_SEATS)
+BANG_USED_KEYS = tuple(_keys(MAX_COUNT) for _ in range(NUM_SEATS))
+CURRENT_KEYS = _keys(NUM_SEATS)
+
+# what an observer sees of the hidden piles: their sizes
+HAND_SIZE_KEYS = tuple(_keys(MAX_COUNT) for _ in range(NUM_SEATS))
+DECK_SIZE_KEYS = _keys(NUM_CARDS + 1)
+OBSERVER_KEYS = _keys(NUM_SEATS)
+
+# fixed for a game, but they tell deals apart (e.g. for MCTS tables kept
+# across games); drawn last so the keys above keep their values
+CHARACTER_INDEX = {name: i for i, (name, _, _) in enumerate(CHARACTERS)}
+CHARACTER_KEYS = tuple(_keys(len(CHARACTERS)) for _ in range(NUM_SEATS))
+MAX_HEALTH_KEYS = tuple(_keys(MAX_HEALTH) for _ in range(NUM_SEATS))
+
+del _rng
+
+
+def player_key(p):
+    """
+    XOR of the keys for a player's character, max health, health,
+    elimination, equipment, jail/dynamite flags and Bang!s used this turn.
+    """
+    s = p.player_id
+    key = CHARACTER_KEYS[s][CHARACTER_INDEX[p.character_name]] ^ MAX_HEALTH_KEYS[s][p.max_health]
+    key ^= HEALTH_KEYS[s][p.health]
+    if p.eliminated:
+        key ^= ELIMINATED_KEYS[s]
+    key ^= WEAPON_KEYS[s][WEAPON_INDEX.get(p.weapon, 0)]
+    key ^= MUSTANG_KEYS[s][p.mustang]
+    key ^= SCOPE_KEYS[s][p.scope]
+    key ^= BARREL_KEYS[s][p.barrel]
+    if p.in_jail:
+        key ^= JAIL_KEYS[s]
+    if p.dynamite:
+        key ^= DYNAMITE_KEYS[s]
+    key ^= BANG_USED_KEYS[s][p.bang_used_this_turn]
+    return key
+
+
+def pile_hash(cards, keys):
+    h = 0
+    for c in cards:
+        h ^= keys[c]
+    return h
+
+
+def public_hash(game):
+    """
+    Hash of every player's public state plus whose turn it is.
+    """
+    h = CURRENT_KEYS[game.current_player_idx]
+    for p in game.players:
+        h ^= player_key(p)
+    return h
+
+
+def full_hash(game):
+    """
+    Recompute BangGame.state_hash from scratch (for checking the
+    incrementally maintained value).
+    """
+    h = public_hash(game)
+    h ^= pile_hash(game.deck.cards, DECK_KEYS)
+    h ^= pile_hash(game.deck.discard_pile, DISCARD_KEYS)
+    for p in game.players:
+        h ^= pile_hash(p.hand, HAND_KEYS[p.player_id])
+    return h